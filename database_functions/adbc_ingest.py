@@ -0,0 +1,72 @@
+import csv
+import logging
+import os
+import sys
+
+import adbc_driver_postgresql.dbapi
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+from dotenv import load_dotenv
+
+from database_functions.insert_functions import (
+    CHILD_TABLES,
+    LOCATION_COLUMNS,
+    LOCATION_FIELDS,
+    TEXT_COLUMNS,
+    sync_serial_sql,
+)
+
+load_dotenv()
+DB_URL = os.getenv("DB_URL")
+
+logger = logging.getLogger(__name__)
+
+
+def read_census_table(path: str) -> pa.Table:
+    with open(path, newline="") as f:
+        header = next(csv.reader(f))
+    names = [h.lower().replace("/", "_") for h in header]
+
+    # Counts are read straight into int32, which matches the INTEGER columns
+    # Postgres expects on the binary COPY wire.
+    column_types = {
+        h: pa.string() if name in TEXT_COLUMNS else pa.int32()
+        for h, name in zip(header, names)
+    }
+    table = pa_csv.read_csv(
+        path, convert_options=pa_csv.ConvertOptions(column_types=column_types)
+    )
+    return table.rename_columns(names)
+
+
+def census_arrow_tables(table: pa.Table) -> dict[str, pa.Table]:
+    # Same ids as load_census: 1-based row numbers, shared by every table.
+    ids = pa.array(range(1, table.num_rows + 1), pa.int32())
+    tables = {
+        "locations": pa.Table.from_arrays(
+            [ids, *(table[f] for f in LOCATION_FIELDS)], names=list(LOCATION_COLUMNS)
+        )
+    }
+    for name, columns in CHILD_TABLES:
+        tables[name] = pa.Table.from_arrays(
+            [ids, *(table[c] for c in columns[1:])], names=list(columns)
+        )
+    return tables
+
+
+def adbc_ingest_all(conn_uri: str, arrow_tables: dict[str, pa.Table]):
+    # Tables are ingested in dict order, so locations must come first.
+    with adbc_driver_postgresql.dbapi.connect(conn_uri) as conn:
+        with conn.cursor() as cur:
+            for name, table in arrow_tables.items():
+                rows = cur.adbc_ingest(name, table, mode="append")
+                logger.info("Ingested %d rows into %s", rows, name)
+            # The ids were written explicitly, so move the locations
+            # sequence past them for insert_census_row.
+            cur.execute(sync_serial_sql("locations"))
+        conn.commit()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    adbc_ingest_all(DB_URL, census_arrow_tables(read_census_table(sys.argv[1])))
@@ -1,227 +1,491 @@
-async def insert_location_row(conn, row: dict, row_id: int):
-    await conn.execute(
-        """
-        INSERT INTO locations (
-            id, state_code, district_code, subdistrict_code,
-            town_village_code, ward_code, eb_code,
-            level, name, tru
-        ) VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10)
-        """,
-        row_id,
-        int(row["State"]),
-        int(row["District"]),
-        int(row["Subdistt"]),
-        int(row["Town/Village"]),
-        int(row["Ward"]),
-        int(row["EB"]),
-        str(row["Level"]),
-        str(row["Name"]),
-        str(row["TRU"]),
-    )
-    print(f"✅ Inserted location with ID {row_id}")
-
-
-async def insert_households_population_row(conn, row: dict, location_id: int):
-    await conn.execute(
-        """
-        INSERT INTO households_and_population (
-            location_id, no_hh, tot_p, tot_m, tot_f,
-            p_06, m_06, f_06
-        ) VALUES ($1, $2, $3, $4, $5, $6, $7, $8)
-        """,
-        location_id,
-        int(row["No_HH"]),
-        int(row["TOT_P"]),
-        int(row["TOT_M"]),
-        int(row["TOT_F"]),
-        int(row["P_06"]),
-        int(row["M_06"]),
-        int(row["F_06"]),
-    )
-    print(f"✅ Inserted households & population for location_id {location_id}")
-
-
-async def insert_scheduled_caste_tribe(conn, row: dict, location_id: int):
-    await conn.execute(
-        """
-        INSERT INTO scheduled_caste_tribe (
-            location_id, 
-            p_sc, m_sc, f_sc, 
-            p_st, m_st, f_st
-        ) VALUES ($1, $2, $3, $4, $5, $6, $7)
-        """,
-        location_id,
-        int(row["P_SC"]),
-        int(row["M_SC"]),
-        int(row["F_SC"]),
-        int(row["P_ST"]),
-        int(row["M_ST"]),
-        int(row["F_ST"]),
-    )
-    print(f"✅ Inserted caste/tribe data for location ID {location_id}")
-
-
-async def insert_literacy_row(conn, row: dict, location_id: int):
-    await conn.execute(
-        """
-        INSERT INTO literacy (
-            location_id,
-            p_lit, m_lit, f_lit,
-            p_ill, m_ill, f_ill
-        ) VALUES ($1, $2, $3, $4, $5, $6, $7)
-        """,
-        location_id,
-        int(row["P_LIT"]),
-        int(row["M_LIT"]),
-        int(row["F_LIT"]),
-        int(row["P_ILL"]),
-        int(row["M_ILL"]),
-        int(row["F_ILL"]),
+import logging
+from collections import namedtuple
+from operator import itemgetter
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# One row of the census sheet, preceded by the id it is stored under. The
+# other field names are the sheet headers lower-cased with "/" replaced by
+# "_", which is also how census_data names its columns.
+CensusRow = namedtuple(
+    "CensusRow",
+    [
+        "id",
+        "state",
+        "district",
+        "subdistt",
+        "town_village",
+        "ward",
+        "eb",
+        "level",
+        "name",
+        "tru",
+        "no_hh",
+        "tot_p",
+        "tot_m",
+        "tot_f",
+        "p_06",
+        "m_06",
+        "f_06",
+        "p_sc",
+        "m_sc",
+        "f_sc",
+        "p_st",
+        "m_st",
+        "f_st",
+        "p_lit",
+        "m_lit",
+        "f_lit",
+        "p_ill",
+        "m_ill",
+        "f_ill",
+        "tot_work_p",
+        "tot_work_m",
+        "tot_work_f",
+        "mainwork_p",
+        "mainwork_m",
+        "mainwork_f",
+        "main_cl_p",
+        "main_cl_m",
+        "main_cl_f",
+        "main_al_p",
+        "main_al_m",
+        "main_al_f",
+        "main_hh_p",
+        "main_hh_m",
+        "main_hh_f",
+        "main_ot_p",
+        "main_ot_m",
+        "main_ot_f",
+        "margwork_p",
+        "margwork_m",
+        "margwork_f",
+        "marg_cl_p",
+        "marg_cl_m",
+        "marg_cl_f",
+        "marg_al_p",
+        "marg_al_m",
+        "marg_al_f",
+        "marg_hh_p",
+        "marg_hh_m",
+        "marg_hh_f",
+        "marg_ot_p",
+        "marg_ot_m",
+        "marg_ot_f",
+        "margwork_3_6_p",
+        "margwork_3_6_m",
+        "margwork_3_6_f",
+        "marg_cl_3_6_p",
+        "marg_cl_3_6_m",
+        "marg_cl_3_6_f",
+        "marg_al_3_6_p",
+        "marg_al_3_6_m",
+        "marg_al_3_6_f",
+        "marg_hh_3_6_p",
+        "marg_hh_3_6_m",
+        "marg_hh_3_6_f",
+        "marg_ot_3_6_p",
+        "marg_ot_3_6_m",
+        "marg_ot_3_6_f",
+        "margwork_0_3_p",
+        "margwork_0_3_m",
+        "margwork_0_3_f",
+        "marg_cl_0_3_p",
+        "marg_cl_0_3_m",
+        "marg_cl_0_3_f",
+        "marg_al_0_3_p",
+        "marg_al_0_3_m",
+        "marg_al_0_3_f",
+        "marg_hh_0_3_p",
+        "marg_hh_0_3_m",
+        "marg_hh_0_3_f",
+        "marg_ot_0_3_p",
+        "marg_ot_0_3_m",
+        "marg_ot_0_3_f",
+        "non_work_p",
+        "non_work_m",
+        "non_work_f",
+    ],
+)
+
+# The CensusRow fields behind LOCATION_COLUMNS[1:], in the same order.
+LOCATION_FIELDS = (
+    "state",
+    "district",
+    "subdistt",
+    "town_village",
+    "ward",
+    "eb",
+    "level",
+    "name",
+    "tru",
+)
+
+# The census sheet's text columns; every other column is a count or a code.
+# A list rather than a tuple, so it can select DataFrame columns directly.
+TEXT_COLUMNS = ["level", "name", "tru"]
+
+# Every other CensusRow field is a count; child tables are loaded from
+# int32 arrays with one column per count field, in this order.
+COUNT_FIELDS = CensusRow._fields[1 + len(LOCATION_FIELDS) :]
+
+LOCATION_COLUMNS = (
+    "id",
+    "state_code",
+    "district_code",
+    "subdistrict_code",
+    "town_village_code",
+    "ward_code",
+    "eb_code",
+    "level",
+    "name",
+    "tru",
+)
+
+HOUSEHOLDS_POPULATION_COLUMNS = (
+    "location_id",
+    "no_hh",
+    "tot_p",
+    "tot_m",
+    "tot_f",
+    "p_06",
+    "m_06",
+    "f_06",
+)
+
+SCHEDULED_CASTE_TRIBE_COLUMNS = (
+    "location_id",
+    "p_sc",
+    "m_sc",
+    "f_sc",
+    "p_st",
+    "m_st",
+    "f_st",
+)
+
+LITERACY_COLUMNS = (
+    "location_id",
+    "p_lit",
+    "m_lit",
+    "f_lit",
+    "p_ill",
+    "m_ill",
+    "f_ill",
+)
+
+WORKERS_TOTAL_COLUMNS = (
+    "location_id",
+    "tot_work_p",
+    "tot_work_m",
+    "tot_work_f",
+    "non_work_p",
+    "non_work_m",
+    "non_work_f",
+)
+
+MAIN_WORKERS_COLUMNS = (
+    "location_id",
+    "mainwork_p",
+    "mainwork_m",
+    "mainwork_f",
+    "main_cl_p",
+    "main_cl_m",
+    "main_cl_f",
+    "main_al_p",
+    "main_al_m",
+    "main_al_f",
+    "main_hh_p",
+    "main_hh_m",
+    "main_hh_f",
+    "main_ot_p",
+    "main_ot_m",
+    "main_ot_f",
+)
+
+MARGINAL_WORKERS_COLUMNS = (
+    "location_id",
+    "margwork_p",
+    "margwork_m",
+    "margwork_f",
+    "marg_cl_p",
+    "marg_cl_m",
+    "marg_cl_f",
+    "marg_al_p",
+    "marg_al_m",
+    "marg_al_f",
+    "marg_hh_p",
+    "marg_hh_m",
+    "marg_hh_f",
+    "marg_ot_p",
+    "marg_ot_m",
+    "marg_ot_f",
+    "margwork_3_6_p",
+    "margwork_3_6_m",
+    "margwork_3_6_f",
+    "marg_cl_3_6_p",
+    "marg_cl_3_6_m",
+    "marg_cl_3_6_f",
+    "marg_al_3_6_p",
+    "marg_al_3_6_m",
+    "marg_al_3_6_f",
+    "marg_hh_3_6_p",
+    "marg_hh_3_6_m",
+    "marg_hh_3_6_f",
+    "marg_ot_3_6_p",
+    "marg_ot_3_6_m",
+    "marg_ot_3_6_f",
+    "margwork_0_3_p",
+    "margwork_0_3_m",
+    "margwork_0_3_f",
+    "marg_cl_0_3_p",
+    "marg_cl_0_3_m",
+    "marg_cl_0_3_f",
+    "marg_al_0_3_p",
+    "marg_al_0_3_m",
+    "marg_al_0_3_f",
+    "marg_hh_0_3_p",
+    "marg_hh_0_3_m",
+    "marg_hh_0_3_f",
+    "marg_ot_0_3_p",
+    "marg_ot_0_3_m",
+    "marg_ot_0_3_f",
+)
+
+
+# Every table that hangs off locations(id), in load order.
+CHILD_TABLES = (
+    ("households_and_population", HOUSEHOLDS_POPULATION_COLUMNS),
+    ("scheduled_caste_tribe", SCHEDULED_CASTE_TRIBE_COLUMNS),
+    ("literacy", LITERACY_COLUMNS),
+    ("workers_total", WORKERS_TOTAL_COLUMNS),
+    ("main_workers", MAIN_WORKERS_COLUMNS),
+    ("marginal_workers", MARGINAL_WORKERS_COLUMNS),
+)
+
+# census_data is the same record as a single wide row: its columns carry
+# the CensusRow field names (the *_code columns are left unset), so a
+# CensusRow is already its COPY record.
+CENSUS_DATA_COLUMNS = CensusRow._fields
+
+
+def _census_row_sql() -> str:
+    # One statement for all seven tables: the location takes its id from the
+    # SERIAL sequence in the first CTE and every child table takes its
+    # location_id from there, so the id never round-trips through Python.
+    # Data-modifying CTEs always run, even when nothing selects from them.
+    location_columns = LOCATION_COLUMNS[1:]
+    location_values = ", ".join(f"${i + 1}" for i in range(len(location_columns)))
+    statements = [
+        f"INSERT INTO locations ({', '.join(location_columns)}) "
+        f"VALUES ({location_values}) RETURNING id"
+    ]
+    param = len(location_columns)
+    for table, columns in CHILD_TABLES:
+        values = []
+        for _ in columns[1:]:
+            param += 1
+            values.append(f"${param}::integer")
+        statements.append(
+            f"INSERT INTO {table} ({', '.join(columns)}) "
+            f"SELECT l.id, {', '.join(values)} FROM l"
+        )
+
+    ctes = [f"l AS ({statements[0]})"]
+    ctes += [f"c{i} AS ({sql})" for i, sql in enumerate(statements[1:-1], 1)]
+    return f"WITH {', '.join(ctes)} {statements[-1]} RETURNING location_id"
+
+
+# Used only for incremental updates; bulk loads go through COPY instead.
+# Built once here, so every call hands asyncpg the same SQL text and hits
+# the connection's prepared-statement cache.
+CENSUS_ROW_SQL = _census_row_sql()
+
+
+def _fields_getter(fields):
+    # Fetches several CensusRow fields in one C-level call.
+    return itemgetter(*map(CensusRow._fields.index, fields))
+
+
+# Each getter returns a table's complete COPY record, id included, so a row
+# costs exactly one tuple allocation per table. Mapping a getter over the
+# rows keeps the whole row-to-record step in C, with no Python frame per row.
+_location_record = _fields_getter(("id", *LOCATION_FIELDS))
+
+# Child table columns are named after the count fields they hold; these
+# are their positions in a counts array.
+_CHILD_COLUMNS = dict(CHILD_TABLES)
+_CHILD_COUNTS = {
+    table: [COUNT_FIELDS.index(column) for column in columns[1:]]
+    for table, columns in CHILD_TABLES
+}
+
+_row_counts = _fields_getter(COUNT_FIELDS)
+
+# All CENSUS_ROW_SQL parameters, in order. The id is assigned by the
+# database, so CensusRow.id is not among them.
+_census_row_params = _fields_getter(
+    (
+        *LOCATION_FIELDS,
+        *(field for _, columns in CHILD_TABLES for field in columns[1:]),
     )
-    print(f"✅ Inserted literacy data for location_id {location_id}")
-
-
-async def insert_workers_total_row(conn, row: dict, location_id: int):
-    await conn.execute(
-        """
-        INSERT INTO workers_total (
-            location_id,
-            tot_work_p, tot_work_m, tot_work_f,
-            non_work_p, non_work_m, non_work_f
-        ) VALUES ($1, $2, $3, $4, $5, $6, $7)
-        """,
-        location_id,
-        int(row["TOT_WORK_P"]),
-        int(row["TOT_WORK_M"]),
-        int(row["TOT_WORK_F"]),
-        int(row["NON_WORK_P"]),
-        int(row["NON_WORK_M"]),
-        int(row["NON_WORK_F"]),
+)
+
+
+def census_counts(rows: list[CensusRow]) -> np.ndarray:
+    # The counts of each row as one int32 array, for the child inserters.
+    counts = np.array(list(map(_row_counts, rows)), dtype=np.int32)
+    return counts.reshape(len(rows), len(COUNT_FIELDS))
+
+
+async def prepare_bulk_load(conn):
+    # A bulk load replaces the census tables: they are emptied first, since
+    # with the keys dropped nothing would stop a second load from appending
+    # duplicate ids (and finish_bulk_load() could then never restore them).
+    # Dropping the keys means each index is built once at the end, which is
+    # far cheaper than updating it (and checking the foreign key) per row.
+    # finish_bulk_load() puts them back; if a load fails half way, run it
+    # again from the start.
+    tables = ", ".join(["locations", *(table for table, _ in CHILD_TABLES)])
+    statements = [f"TRUNCATE {tables}"]
+    for table, _ in CHILD_TABLES:
+        statements += [
+            f"ALTER TABLE {table} DROP CONSTRAINT IF EXISTS {table}_location_id_fkey",
+            f"ALTER TABLE {table} DROP CONSTRAINT IF EXISTS {table}_pkey",
+        ]
+    statements.append("ALTER TABLE locations DROP CONSTRAINT IF EXISTS locations_pkey")
+    await conn.execute(";\n".join(statements))
+
+
+def sync_serial_sql(table: str) -> str:
+    # COPY writes explicit ids, which leaves the SERIAL sequence behind;
+    # move it past them so insert_census_row doesn't hand out a taken id.
+    return (
+        f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+        f"COALESCE(MAX(id), 0) + 1, false) FROM {table}"
     )
-    print(f"✅ Inserted workers_total data for location_id {location_id}")
-
-
-async def insert_main_workers_row(conn, row: dict, location_id: int):
-    await conn.execute(
-        """
-        INSERT INTO main_workers (
-            location_id,
-            mainwork_p, mainwork_m, mainwork_f,
-            main_cl_p, main_cl_m, main_cl_f,
-            main_al_p, main_al_m, main_al_f,
-            main_hh_p, main_hh_m, main_hh_f,
-            main_ot_p, main_ot_m, main_ot_f
-        ) VALUES (
-            $1, $2, $3, $4,
-            $5, $6, $7,
-            $8, $9, $10,
-            $11, $12, $13,
-            $14, $15, $16
+
+
+async def sync_census_data_ids(conn):
+    await conn.execute(sync_serial_sql("census_data"))
+
+
+async def finish_bulk_load(conn):
+    statements = [
+        "ALTER TABLE locations ADD PRIMARY KEY (id)",
+        sync_serial_sql("locations"),
+    ]
+    for table, _ in CHILD_TABLES:
+        statements += [
+            f"ALTER TABLE {table} ADD PRIMARY KEY (location_id)",
+            f"ALTER TABLE {table} ADD CONSTRAINT {table}_location_id_fkey "
+            "FOREIGN KEY (location_id) REFERENCES locations(id) NOT VALID",
+        ]
+    await conn.execute(";\n".join(statements))
+    # The keys are committed above; each VALIDATE then runs in a transaction
+    # of its own, which only takes a SHARE UPDATE EXCLUSIVE lock, so the
+    # tables stay readable and writable while their rows are checked.
+    for table, _ in CHILD_TABLES:
+        await conn.execute(
+            f"ALTER TABLE {table} VALIDATE CONSTRAINT {table}_location_id_fkey"
         )
-        """,
-        location_id,
-        int(row["MAINWORK_P"]),
-        int(row["MAINWORK_M"]),
-        int(row["MAINWORK_F"]),
-        int(row["MAIN_CL_P"]),
-        int(row["MAIN_CL_M"]),
-        int(row["MAIN_CL_F"]),
-        int(row["MAIN_AL_P"]),
-        int(row["MAIN_AL_M"]),
-        int(row["MAIN_AL_F"]),
-        int(row["MAIN_HH_P"]),
-        int(row["MAIN_HH_M"]),
-        int(row["MAIN_HH_F"]),
-        int(row["MAIN_OT_P"]),
-        int(row["MAIN_OT_M"]),
-        int(row["MAIN_OT_F"]),
-    )
-    print(f"✅ Inserted main_workers data for location_id {location_id}")
-
-
-async def insert_marginal_workers_row(conn, row: dict, location_id: int):
-    await conn.execute(
-        """
-        INSERT INTO marginal_workers (
-            location_id,
-            margwork_p, margwork_m, margwork_f,
-            marg_cl_p, marg_cl_m, marg_cl_f,
-            marg_al_p, marg_al_m, marg_al_f,
-            marg_hh_p, marg_hh_m, marg_hh_f,
-            marg_ot_p, marg_ot_m, marg_ot_f,
-            margwork_3_6_p, margwork_3_6_m, margwork_3_6_f,
-            marg_cl_3_6_p, marg_cl_3_6_m, marg_cl_3_6_f,
-            marg_al_3_6_p, marg_al_3_6_m, marg_al_3_6_f,
-            marg_hh_3_6_p, marg_hh_3_6_m, marg_hh_3_6_f,
-            marg_ot_3_6_p, marg_ot_3_6_m, marg_ot_3_6_f,
-            margwork_0_3_p, margwork_0_3_m, margwork_0_3_f,
-            marg_cl_0_3_p, marg_cl_0_3_m, marg_cl_0_3_f,
-            marg_al_0_3_p, marg_al_0_3_m, marg_al_0_3_f,
-            marg_hh_0_3_p, marg_hh_0_3_m, marg_hh_0_3_f,
-            marg_ot_0_3_p, marg_ot_0_3_m, marg_ot_0_3_f
-        ) VALUES (
-            $1, $2, $3, $4,
-            $5, $6, $7,
-            $8, $9, $10,
-            $11, $12, $13,
-            $14, $15, $16,
-            $17, $18, $19,
-            $20, $21, $22,
-            $23, $24, $25,
-            $26, $27, $28,
-            $29, $30, $31,
-            $32, $33, $34,
-            $35, $36, $37,
-            $38, $39, $40,
-            $41, $42, $43,
-            $44, $45, $46
+
+
+async def _streamed_location_records(chunks):
+    async for chunk in chunks:
+        for record in map(_location_record, chunk):
+            yield record
+
+
+async def _streamed_records(chunks):
+    async for chunk in chunks:
+        for record in chunk:
+            yield record
+
+
+class Inserters:
+    """Census inserters bound to one connection.
+
+    The ``*_many`` methods stream rows to Postgres over binary COPY, one
+    command per table. ``insert_census_row`` is the incremental path: one
+    statement covering all seven tables, which returns the id the database
+    gave the new location. asyncpg prepares it once per connection and
+    reuses it from its statement cache.
+    Rows are CensusRows whose fields already have their final types (ints,
+    and str for level/name/tru), as produced by ``load_census``. The child
+    table methods instead take the location ids and an int32 array of the
+    matching rows' COUNT_FIELDS (see ``census_counts``), several times
+    smaller than the same counts held as Python ints.
+    """
+
+    def __init__(self, conn):
+        self._conn = conn
+
+    async def _copy(self, table: str, columns: tuple[str, ...], records):
+        status = await self._conn.copy_records_to_table(
+            table, records=records, columns=columns
         )
-        """,
-        location_id,
-        int(row["MARGWORK_P"]),
-        int(row["MARGWORK_M"]),
-        int(row["MARGWORK_F"]),
-        int(row["MARG_CL_P"]),
-        int(row["MARG_CL_M"]),
-        int(row["MARG_CL_F"]),
-        int(row["MARG_AL_P"]),
-        int(row["MARG_AL_M"]),
-        int(row["MARG_AL_F"]),
-        int(row["MARG_HH_P"]),
-        int(row["MARG_HH_M"]),
-        int(row["MARG_HH_F"]),
-        int(row["MARG_OT_P"]),
-        int(row["MARG_OT_M"]),
-        int(row["MARG_OT_F"]),
-        int(row["MARGWORK_3_6_P"]),
-        int(row["MARGWORK_3_6_M"]),
-        int(row["MARGWORK_3_6_F"]),
-        int(row["MARG_CL_3_6_P"]),
-        int(row["MARG_CL_3_6_M"]),
-        int(row["MARG_CL_3_6_F"]),
-        int(row["MARG_AL_3_6_P"]),
-        int(row["MARG_AL_3_6_M"]),
-        int(row["MARG_AL_3_6_F"]),
-        int(row["MARG_HH_3_6_P"]),
-        int(row["MARG_HH_3_6_M"]),
-        int(row["MARG_HH_3_6_F"]),
-        int(row["MARG_OT_3_6_P"]),
-        int(row["MARG_OT_3_6_M"]),
-        int(row["MARG_OT_3_6_F"]),
-        int(row["MARGWORK_0_3_P"]),
-        int(row["MARGWORK_0_3_M"]),
-        int(row["MARGWORK_0_3_F"]),
-        int(row["MARG_CL_0_3_P"]),
-        int(row["MARG_CL_0_3_M"]),
-        int(row["MARG_CL_0_3_F"]),
-        int(row["MARG_AL_0_3_P"]),
-        int(row["MARG_AL_0_3_M"]),
-        int(row["MARG_AL_0_3_F"]),
-        int(row["MARG_HH_0_3_P"]),
-        int(row["MARG_HH_0_3_M"]),
-        int(row["MARG_HH_0_3_F"]),
-        int(row["MARG_OT_0_3_P"]),
-        int(row["MARG_OT_0_3_M"]),
-        int(row["MARG_OT_0_3_F"]),
-    )
-    print(f"✅ Inserted marginal_workers data for location_id {location_id}")
+        logger.info("Copied into %s: %s", table, status)
+
+    async def _copy_child(self, table: str, ids, counts: np.ndarray):
+        # tolist() boxes the table's columns straight from the array in one
+        # C call, and zip() pairs them up with the location ids.
+        columns = counts[:, _CHILD_COUNTS[table]].T.tolist()
+        await self._copy(table, _CHILD_COLUMNS[table], zip(ids, *columns))
+
+    async def insert_locations_many(self, rows: list[CensusRow]):
+        await self._copy("locations", LOCATION_COLUMNS, map(_location_record, rows))
+
+    async def insert_locations_stream(self, chunks):
+        # Accepts an async iterator of row lists, so COPY can start sending
+        # while the rest of the file is still being parsed.
+        await self._copy(
+            "locations", LOCATION_COLUMNS, _streamed_location_records(chunks)
+        )
+
+    async def insert_census_data_many(self, rows: list[CensusRow]):
+        # One wide row per record: no joins back to locations, no foreign
+        # keys to check, and a single index to maintain.
+        await self._copy("census_data", CENSUS_DATA_COLUMNS, rows)
+
+    async def insert_census_data_stream(self, chunks):
+        await self._copy("census_data", CENSUS_DATA_COLUMNS, _streamed_records(chunks))
+
+    async def insert_households_population_many(self, ids, counts: np.ndarray):
+        await self._copy_child("households_and_population", ids, counts)
+
+    async def insert_scheduled_caste_tribe_many(self, ids, counts: np.ndarray):
+        await self._copy_child("scheduled_caste_tribe", ids, counts)
+
+    async def insert_literacy_many(self, ids, counts: np.ndarray):
+        await self._copy_child("literacy", ids, counts)
+
+    async def insert_workers_total_many(self, ids, counts: np.ndarray):
+        await self._copy_child("workers_total", ids, counts)
+
+    async def insert_main_workers_many(self, ids, counts: np.ndarray):
+        await self._copy_child("main_workers", ids, counts)
+
+    async def insert_marginal_workers_many(self, ids, counts: np.ndarray):
+        await self._copy_child("marginal_workers", ids, counts)
+
+    async def insert_census_many(self, rows: list[CensusRow]):
+        # Child tables reference locations(id), so parents have to land first.
+        await self.insert_locations_many(rows)
+        ids = [row.id for row in rows]
+        counts = census_counts(rows)
+        await self.insert_households_population_many(ids, counts)
+        await self.insert_scheduled_caste_tribe_many(ids, counts)
+        await self.insert_literacy_many(ids, counts)
+        await self.insert_workers_total_many(ids, counts)
+        await self.insert_main_workers_many(ids, counts)
+        await self.insert_marginal_workers_many(ids, counts)
+
+    async def insert_census_row(self, row: CensusRow) -> int:
+        # row.id is ignored; the new location id is returned instead.
+        location_id = await self._conn.fetchval(
+            CENSUS_ROW_SQL, *_census_row_params(row)
+        )
+        logger.debug("Inserted census row %d", location_id)
+        return location_id
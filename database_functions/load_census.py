@@ -0,0 +1,184 @@
+import asyncio
+import logging
+import os
+import sys
+
+import asyncpg
+import numpy as np
+import pandas as pd
+from dotenv import load_dotenv
+
+try:
+    import uvloop
+except ImportError:  # not available on Windows
+    uvloop = None
+
+from database_functions.insert_functions import (
+    COUNT_FIELDS,
+    TEXT_COLUMNS,
+    CensusRow,
+    Inserters,
+    finish_bulk_load,
+    prepare_bulk_load,
+    sync_census_data_ids,
+)
+
+load_dotenv()
+DB_URL = os.getenv("DB_URL")
+
+# Each of these only depends on locations(id), so once the parent rows are
+# committed they can be loaded side by side on separate connections.
+CHILD_INSERTS = (
+    Inserters.insert_households_population_many,
+    Inserters.insert_scheduled_caste_tribe_many,
+    Inserters.insert_literacy_many,
+    Inserters.insert_workers_total_many,
+    Inserters.insert_main_workers_many,
+    Inserters.insert_marginal_workers_many,
+)
+
+# CSVs are parsed this many rows at a time; at most QUEUE_CHUNKS parsed
+# chunks wait for COPY before the reader pauses.
+CHUNK_SIZE = 10_000
+QUEUE_CHUNKS = 4
+
+# Each child table is split into SHARDS slices by row id and every slice is
+# copied on its own connection. Postgres runs one backend per connection,
+# so this spreads the load across server CPUs until WAL becomes the limit.
+SHARDS = 8
+POOL_MIN_SIZE = 8
+POOL_MAX_SIZE = 16
+
+
+def _normalize(df: pd.DataFrame) -> pd.DataFrame:
+    df.columns = [c.lower().replace("/", "_") for c in df.columns]
+
+    # Coerce all numeric columns in one vectorized pass so the inserters
+    # receive ready-made ints instead of parsing every cell themselves.
+    # int32 matches the INTEGER columns and keeps the frames a quarter of
+    # the size, but astype() wraps on overflow, so check the range first.
+    int_columns = [c for c in df.columns if c not in TEXT_COLUMNS]
+    values = df[int_columns].astype("int64")
+    if (values.abs() > np.iinfo(np.int32).max).any(axis=None):
+        raise ValueError("census value out of INTEGER range")
+    df[int_columns] = values.astype("int32")
+    # A purely numeric name would otherwise come through as an int.
+    df[TEXT_COLUMNS] = df[TEXT_COLUMNS].astype(str)
+    return df
+
+
+def read_census_chunks(path: str):
+    if path.endswith((".xls", ".xlsx")):
+        # Excel sheets can't be read incrementally.
+        yield _normalize(pd.read_excel(path))
+    else:
+        for chunk in pd.read_csv(path, chunksize=CHUNK_SIZE):
+            yield _normalize(chunk)
+
+
+async def _read_census_into(path: str, queue: asyncio.Queue):
+    chunks = read_census_chunks(path)
+    row_id = 1
+    # Parse in a worker thread so the event loop keeps feeding COPY.
+    while (df := await asyncio.to_thread(next, chunks, None)) is not None:
+        # tolist() unboxes a whole column into plain Python ints in one C
+        # call, and zip() assembles the CensusRow tuples column-wise.
+        ids = range(row_id, row_id + len(df))
+        columns = [df[field].tolist() for field in CensusRow._fields[1:]]
+        rows = list(map(CensusRow._make, zip(ids, *columns)))
+        row_id += len(rows)
+        await queue.put((rows, df[list(COUNT_FIELDS)].to_numpy()))
+    await queue.put(None)
+
+
+async def _insert_in_transaction(pool, insert, *args):
+    async with pool.acquire() as conn:
+        async with conn.transaction():
+            # One-shot ingest: if the server crashes we simply rerun the
+            # load, so there is no need to wait on a WAL flush per commit.
+            await conn.execute("SET LOCAL synchronous_commit = off")
+            await insert(Inserters(conn), *args)
+
+
+async def load_census(path: str):
+    queue = asyncio.Queue(maxsize=QUEUE_CHUNKS)
+    count_chunks = []
+
+    async def parsed_chunks():
+        while (chunk := await queue.get()) is not None:
+            rows, counts = chunk
+            # Keep only the int32 counts for the child tables; the rows are
+            # dropped as soon as COPY has sent them.
+            count_chunks.append(counts)
+            yield rows
+
+    async with asyncpg.create_pool(
+        DB_URL, min_size=POOL_MIN_SIZE, max_size=POOL_MAX_SIZE
+    ) as pool:
+        async with pool.acquire() as conn:
+            await prepare_bulk_load(conn)
+
+        # A TaskGroup cancels the COPY (rolling it back) if parsing fails.
+        async with asyncio.TaskGroup() as tg:
+            tg.create_task(_read_census_into(path, queue))
+            tg.create_task(
+                _insert_in_transaction(
+                    pool, Inserters.insert_locations_stream, parsed_chunks()
+                )
+            )
+
+        if count_chunks:
+            counts = np.concatenate(count_chunks)
+        else:
+            counts = np.empty((0, len(COUNT_FIELDS)), dtype=np.int32)
+        # Row ids run from 1, so row i of counts belongs to location i + 1.
+        bounds = [len(counts) * i // SHARDS for i in range(SHARDS + 1)]
+        shards = [(lo, hi) for lo, hi in zip(bounds, bounds[1:]) if lo < hi]
+        # If one shard fails, the TaskGroup cancels the others, which rolls
+        # back their transactions instead of leaving them running.
+        async with asyncio.TaskGroup() as tg:
+            for insert in CHILD_INSERTS:
+                for lo, hi in shards:
+                    tg.create_task(
+                        _insert_in_transaction(
+                            pool, insert, range(lo + 1, hi + 1), counts[lo:hi]
+                        )
+                    )
+
+        async with pool.acquire() as conn:
+            await finish_bulk_load(conn)
+
+
+async def load_census_data(path: str):
+    # Loads the wide census_data table that the API reads from. A single
+    # COPY covers every column, so there is nothing to shard.
+    queue = asyncio.Queue(maxsize=QUEUE_CHUNKS)
+
+    async def parsed_chunks():
+        while (chunk := await queue.get()) is not None:
+            yield chunk[0]
+
+    async with asyncpg.create_pool(DB_URL, min_size=1, max_size=1) as pool:
+        async with asyncio.TaskGroup() as tg:
+            tg.create_task(_read_census_into(path, queue))
+            tg.create_task(
+                _insert_in_transaction(
+                    pool, Inserters.insert_census_data_stream, parsed_chunks()
+                )
+            )
+
+        async with pool.acquire() as conn:
+            await sync_census_data_ids(conn)
+            # The API joins state names from this view. CONCURRENTLY (which
+            # needs mv_states_state_idx) keeps it readable during the refresh.
+            await conn.execute("REFRESH MATERIALIZED VIEW CONCURRENTLY mv_states")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    # The loader spends most of its time awaiting small socket reads and
+    # writes, which is where libuv's loop is cheapest.
+    run = uvloop.run if uvloop else asyncio.run
+    # --census-data loads the wide table instead of the normalized ones.
+    load = load_census_data if "--census-data" in sys.argv[2:] else load_census
+    run(load(sys.argv[1]))
@@ -1,21 +1,143 @@
 import asyncio
+import hashlib
+import logging
 import os
-from collections import defaultdict
+import time
+from collections import OrderedDict
 from contextlib import asynccontextmanager
+from functools import lru_cache
 from typing import Literal, Optional
+from urllib.parse import urlencode
 
 import asyncpg
+import orjson
 
 # import pandas as pd
 from dotenv import load_dotenv
-from fastapi import FastAPI, HTTPException, Query
-from fastapi.responses import JSONResponse
+from fastapi import FastAPI, HTTPException, Query, Request, Response
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from fastapi_cache import FastAPICache
+from fastapi_cache.backends import Backend
+from fastapi_cache.backends.redis import RedisBackend
+from fastapi_cache.coder import Coder
+from fastapi_cache.decorator import cache
+from redis import asyncio as aioredis
 
 # Load DB_URL from .env
 load_dotenv()
 DB_URL = os.getenv("DB_URL")
 print("Loaded DB_URL:", DB_URL)
 
+logger = logging.getLogger(__name__)
+
+# Responses are cached in Redis when REDIS_URL is set, otherwise in process
+# up to CACHE_MAX_BYTES of response bodies per worker. The census data
+# doesn't change while the app is running, so the TTL is long.
+REDIS_URL = os.getenv("REDIS_URL")
+CACHE_TTL = 60 * 60 * 24
+CACHE_MAX_BYTES = int(os.getenv("CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+# Part of every ETag. Bump it after reloading census_data so clients and
+# CDNs stop revalidating against the old data.
+DATA_VERSION = os.getenv("DATA_VERSION", "1")
+
+# Pool settings can be overridden from the environment. Set
+# STATEMENT_CACHE_SIZE=0 when DB_URL points at a transaction-mode pooler
+# (pgbouncer / Supabase pooler), which can't keep prepared statements.
+# Otherwise asyncpg keeps up to STATEMENT_CACHE_SIZE prepared statements per
+# connection, keyed by SQL text, so each fixed query is parsed and planned
+# once per connection and reused from then on.
+POOL_MIN_SIZE = int(os.getenv("POOL_MIN_SIZE", "5"))
+POOL_MAX_SIZE = int(os.getenv("POOL_MAX_SIZE", "50"))
+STATEMENT_CACHE_SIZE = int(os.getenv("STATEMENT_CACHE_SIZE", "1024"))
+
+# State names are resolved to codes in process (see state_codes), so the
+# API needs a restart after census_data is reloaded.
+STATE_MAP_QUERY = "SELECT state, name, name_norm FROM mv_states"
+
+
+class LRUBackend(Backend):
+    """In-process response cache bounded by the total size of its bodies.
+
+    fastapi-cache's InMemoryBackend only drops an expired key when that key
+    is read again, so varied query strings could grow it without limit.
+    This one evicts the least recently used bodies once ``max_bytes`` is
+    exceeded.
+    """
+
+    def __init__(self, max_bytes: int):
+        self._entries = OrderedDict()  # key -> (expires_at, body)
+        self._size = 0
+        self._max_bytes = max_bytes
+
+    def _get(self, key: str):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= time.monotonic():
+            self._remove(key)
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def _remove(self, key: str):
+        _, body = self._entries.pop(key)
+        self._size -= len(body)
+
+    async def get_with_ttl(self, key: str):
+        entry = self._get(key)
+        if entry is None:
+            return 0, None
+        return int(entry[0] - time.monotonic()), entry[1]
+
+    async def get(self, key: str):
+        entry = self._get(key)
+        return None if entry is None else entry[1]
+
+    async def set(self, key: str, value: bytes, expire: Optional[int] = None):
+        if key in self._entries:
+            self._remove(key)
+        if len(value) > self._max_bytes:
+            return
+        self._entries[key] = (time.monotonic() + (expire or CACHE_TTL), value)
+        self._size += len(value)
+        while self._size > self._max_bytes:
+            self._remove(next(iter(self._entries)))
+
+    async def clear(self, namespace: Optional[str] = None, key: Optional[str] = None):
+        if namespace:
+            keys = [k for k in self._entries if k.startswith(namespace)]
+        else:
+            keys = [key] if key in self._entries else []
+        for k in keys:
+            self._remove(k)
+        return len(keys)
+
+
+def census_cache_key(
+    func, namespace: str = "", *, request=None, response=None, args=(), kwargs=None
+):
+    # Free-text parameters are keyed by what the handler resolves them to,
+    # so spelling, ordering and unknown-name variants of a request share one
+    # entry instead of each adding their own. Every normalisation here
+    # matches the handler's own, so invalid input never hits a valid entry.
+    params = dict(kwargs or {})
+    codes = app.state.state_codes
+    if "states" in params:
+        names = [s.strip().lower() for s in params["states"].split(",") if s.strip()]
+        # No names at all is a 400, unlike names that match no state.
+        params["states"] = (
+            sorted({codes[n] for n in names if n in codes}) if names else None
+        )
+    if "state" in params:
+        params["state"] = codes.get(params["state"].strip().lower())
+    if params.get("tru"):
+        params["tru"] = params["tru"].lower()
+    if params.get("fields"):
+        params["fields"] = [
+            f.strip() for f in params["fields"].split(",") if f.strip() in STATE_FIELDS
+        ]
+    return f"{namespace}:{func.__module__}:{func.__name__}:{sorted(params.items())}"
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -23,7 +145,21 @@ async def lifespan(app: FastAPI):
     delay = 3
     for attempt in range(1, max_retries + 1):
         try:
-            app.state.db_pool = await asyncpg.create_pool(DB_URL)
+            pool = await asyncpg.create_pool(
+                DB_URL,
+                min_size=POOL_MIN_SIZE,
+                max_size=POOL_MAX_SIZE,
+                max_inactive_connection_lifetime=300,
+                command_timeout=10,
+                statement_cache_size=STATEMENT_CACHE_SIZE,
+            )
+            try:
+                # Make sure queries actually go through before serving.
+                await pool.fetchval("SELECT 1")
+            except Exception:
+                await pool.close()
+                raise
+            app.state.db_pool = pool
             print(f"✅ Connected to database (attempt {attempt})")
             break
         except Exception as e:
@@ -31,11 +167,80 @@ async def lifespan(app: FastAPI):
             if attempt == max_retries:
                 raise e
             await asyncio.sleep(delay)
+
+    rows = await app.state.db_pool.fetch(STATE_MAP_QUERY)
+    app.state.state_codes = {row["name_norm"]: row["state"] for row in rows}
+    app.state.state_names = {row["state"]: row["name"] for row in rows}
+
+    if REDIS_URL:
+        backend = RedisBackend(aioredis.from_url(REDIS_URL))
+    else:
+        backend = LRUBackend(CACHE_MAX_BYTES)
+    FastAPICache.init(
+        backend, prefix="census", coder=ORJSONCoder, key_builder=census_cache_key
+    )
     yield
     await app.state.db_pool.close()
 
 
-app = FastAPI(lifespan=lifespan)
+class ORJSONCoder(Coder):
+    # Caches the encoded body of a handler's ORJSONResponse and sends it back
+    # as is on a hit, without decoding and re-encoding it.
+    @classmethod
+    def encode(cls, value) -> bytes:
+        if isinstance(value, Response):
+            return value.body
+        return orjson.dumps(value)
+
+    @classmethod
+    def decode(cls, value: bytes) -> Response:
+        return Response(value, media_type="application/json")
+
+
+# orjson serialises the (often large) responses several times faster than
+# the standard library's json module. Handlers return ORJSONResponse
+# themselves: FastAPI would otherwise run its pure-Python jsonable_encoder
+# over the whole payload before the response class sees it.
+app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
+
+# Every other GET route is served from the census data.
+UNVERSIONED_PATHS = {
+    "/",
+    app.openapi_url,
+    app.docs_url,
+    app.redoc_url,
+    app.swagger_ui_oauth2_redirect_url,
+}
+
+
+def url_etag(request: Request) -> str:
+    # The data only changes with DATA_VERSION, so a response is fully
+    # determined by its path and query. Parameter order doesn't matter, and
+    # the digest is stable across workers and restarts.
+    query = urlencode(sorted(request.query_params.multi_items()))
+    digest = hashlib.blake2b(
+        f"{request.url.path}?{query}".encode(), digest_size=16
+    ).hexdigest()
+    return f'"census-v{DATA_VERSION}-{digest}"'
+
+
+@app.middleware("http")
+async def etag_middleware(request: Request, call_next):
+    if request.method != "GET" or request.url.path in UNVERSIONED_PATHS:
+        return await call_next(request)
+
+    # A matching If-None-Match is answered before the handler, the response
+    # cache or the database are touched.
+    etag = url_etag(request)
+    if_none_match = request.headers.get("if-none-match", "")
+    if etag in (tag.strip() for tag in if_none_match.split(",")):
+        return Response(status_code=304, headers={"ETag": etag})
+
+    response = await call_next(request)
+    if response.status_code == 200:
+        response.headers["ETag"] = etag
+        response.headers["Cache-Control"] = f"max-age={CACHE_TTL}"
+    return response
 
 
 @app.api_route("/", methods=["GET", "HEAD"])
@@ -43,24 +248,63 @@ async def root():
     return {"message": "Welcome to Indian Census API 2 🚀"}
 
 
+STATE_BASE_COLUMNS = ["state", "name", "level"]
+STATE_COUNT_FIELDS = {
+    "district_count": ("district", "district"),
+    "subdistrict_count": ("subdistt", "sub-district"),
+    "village_count": ("town_village", "village"),
+    "town_count": ("town_village", "town"),
+}
+STATE_FIELDS = STATE_BASE_COLUMNS + list(STATE_COUNT_FIELDS)
+# Identifiers can't be bound as parameters, so the sort is looked up in
+# fixed SQL fragments rather than formatted in from the request.
+STATE_SORT_COLUMNS = {"state": "state", "name": "name", "level": "level"}
+STATE_SORT_DIRECTIONS = {"asc": "ASC", "desc": "DESC"}
+
+
+# The /states SQL depends only on which fields and sort were picked, so each
+# variant is built once and then reused.
+@lru_cache(maxsize=256)
+def states_query(fields: tuple, sort_by: str, sort_order: str) -> str:
+    order_by = f"{STATE_SORT_COLUMNS[sort_by]} {STATE_SORT_DIRECTIONS[sort_order]}"
+    # Values are bound, so every page and state filter shares one statement.
+    # Each state has exactly one Total row, so no de-duplication is needed.
+    return f"""
+        SELECT {", ".join(fields)}
+        FROM census_data
+        WHERE level_norm = 'state' AND tru_norm = 'total'
+        AND ($1::int IS NULL OR state = $1)
+        ORDER BY {order_by}
+        LIMIT $2 OFFSET $3
+    """
+
+
+@lru_cache(maxsize=256)
+def state_counts_query(counts: tuple) -> str:
+    # All selected counts come from one scan: each is a DISTINCT count
+    # filtered to its own level.
+    count_columns = ", ".join(
+        f"COUNT(DISTINCT {STATE_COUNT_FIELDS[f][0]}) "
+        f"FILTER (WHERE level_norm = '{STATE_COUNT_FIELDS[f][1]}') AS {f}"
+        for f in counts
+    )
+    return f"""
+        SELECT state, {count_columns}
+        FROM census_data
+        WHERE level_norm = ANY($1::text[])
+        GROUP BY state
+    """
+
+
 @app.get("/states", summary="Get State Metadata", tags=["States"])
+@cache(expire=CACHE_TTL)
 async def list_states(
     fields: Optional[str] = Query(
         None,
         description="Comma-separated list of fields to return. Allowed: state, name, level, district_count, subdistrict_count, town_count, village_count",
         example="state,name,district_count",
     ),
-    sort_by: Optional[
-        Literal[
-            "state",
-            "name",
-            "level",
-            "district_count",
-            "subdistrict_count",
-            "town_count",
-            "village_count",
-        ]
-    ] = Query(
+    sort_by: Optional[Literal["state", "name", "level"]] = Query(
         "state", description="Field to sort by. Default is 'state'.", example="state"
     ),
     sort_order: Optional[Literal["asc", "desc"]] = Query(
@@ -78,76 +322,84 @@ async def list_states(
     ),
     offset: int = Query(0, ge=0, description="Pagination offset.", example=0),
 ):
-    base_columns = ["state", "name", "level"]
-    count_fields = {
-        "district_count": ("district", "district"),
-        "subdistrict_count": ("subdistt", "sub-district"),
-        "village_count": ("town_village", "village"),
-        "town_count": ("town_village", "town"),
-    }
-    allowed_fields = base_columns + list(count_fields.keys())
-
     # Handle selected fields
     if fields:
         selected_fields = [
-            f.strip() for f in fields.split(",") if f.strip() in allowed_fields
+            f.strip() for f in fields.split(",") if f.strip() in STATE_FIELDS
         ]
         if not selected_fields:
             raise HTTPException(status_code=400, detail="No valid fields selected")
     else:
         selected_fields = ["state", "name"]
 
-    selected_base = [f for f in selected_fields if f in base_columns]
-    selected_counts = [f for f in selected_fields if f in count_fields]
-
-    base_field_str = ", ".join(f"{f}" for f in selected_base)
-
-    # Final SELECT query (no parameters inside subquery)
-    base_query = f"""
-        SELECT * FROM (
-            SELECT DISTINCT ON (state) {base_field_str}
-            FROM census_data
-            WHERE TRIM(LOWER(level)) = 'state'
-            ORDER BY state, {sort_by or 'state'} {(sort_order or 'asc').upper()}
-        ) AS sorted_states
-        {f"WHERE state = {state_code}" if state_code is not None else ""}
-        ORDER BY {sort_by or 'state'} {(sort_order or 'asc').upper()}
-        LIMIT {limit} OFFSET {offset}
-    """
+    selected_base = [f for f in selected_fields if f in STATE_BASE_COLUMNS]
+    selected_counts = [f for f in selected_fields if f in STATE_COUNT_FIELDS]
 
-    async with app.state.db_pool.acquire() as conn:
-        try:
-            base_rows = await conn.fetch(base_query)
-            results = [dict(r) for r in base_rows]
-
-            # Fetch all counts (batch per count field)
-            counts_by_state = {}
-            for field in selected_counts:
-                code_column, level_name = count_fields[field]
-                count_query = f"""
-                    SELECT state, COUNT(DISTINCT {code_column}) AS count
-                    FROM census_data
-                    WHERE TRIM(LOWER(level)) = $1
-                    GROUP BY state
-                """
-                rows = await conn.fetch(count_query, level_name.lower())
-                for row in rows:
-                    st_code = row["state"]
-                    if st_code not in counts_by_state:
-                        counts_by_state[st_code] = {}
-                    counts_by_state[st_code][field] = row["count"]
-
-            # Merge counts into main result
-            for result in results:
-                st_code = result["state"]
-                result.update(counts_by_state.get(st_code, {}))
-
-            return JSONResponse(content=results)
-        except Exception as e:
-            raise HTTPException(status_code=500, detail=str(e))
+    base_query = states_query(
+        tuple(selected_base), sort_by or "state", sort_order or "asc"
+    )
+    count_query = state_counts_query(tuple(selected_counts))
+    count_levels = [STATE_COUNT_FIELDS[f][1] for f in selected_counts]
+
+    pool = app.state.db_pool
+
+    async def fetch_counts():
+        if not selected_counts:
+            return []
+        return await pool.fetch(count_query, count_levels)
+
+    try:
+        # The base and count queries are independent; each one borrows its
+        # own pool connection so they run at once.
+        base_rows, count_rows = await asyncio.gather(
+            pool.fetch(base_query, state_code, limit, offset), fetch_counts()
+        )
+        counts_by_state = {row["state"]: row for row in count_rows}
+
+        # Merge counts into each row as its result is built
+        results = []
+        for row in base_rows:
+            result = dict(row)
+            counts = counts_by_state.get(row["state"])
+            if counts:
+                for f in selected_counts:
+                    result[f] = counts[f]
+            results.append(result)
+
+        return ORJSONResponse(results)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+def state_codes(names):
+    # Unknown names are dropped, so they simply match no rows.
+    codes = app.state.state_codes
+    return [codes[name] for name in names if name in codes]
+
+
+# Appended to a state query to narrow it to one TRU, bound as $2. The
+# queries select tru_norm as tru, so rows already carry the lower-cased
+# keys the responses use.
+TRU_FILTER = "    AND tru_norm = $2\n"
+
+POPULATION_QUERY = """
+    SELECT name, state, tru_norm AS tru, tot_p AS population
+    FROM census_data
+    WHERE level_norm = 'state'
+    AND state = ANY($1::int[])
+"""
+POPULATION_QUERY_TRU = POPULATION_QUERY + TRU_FILTER
+
+STATE_NAMES_QUERY = """
+    SELECT name, state
+    FROM census_data
+    WHERE level_norm = 'state'
+    AND state = ANY($1::int[])
+""" + TRU_FILTER
 
 
 @app.get("/state-population")
+@cache(expire=CACHE_TTL)
 async def get_state_population(
     states: str = Query(
         ...,  # Required
@@ -173,55 +425,56 @@ async def get_state_population(
     if not state_list:
         raise HTTPException(status_code=400, detail="No valid state names provided.")
 
-    placeholders = ", ".join(f"${i+1}" for i in range(len(state_list)))
-    base_values = list(state_list)
+    base_values = [state_codes(state_list)]
 
-    meta_query = f"""
-        SELECT DISTINCT name, state
-        FROM census_data
-        WHERE TRIM(LOWER(level)) = 'state'
-        AND TRIM(LOWER(name)) IN ({placeholders})
-    """
-
-    pop_query = f"""
-        SELECT name, state, tru, tot_p AS population
-        FROM census_data
-        WHERE TRIM(LOWER(level)) = 'state'
-        AND TRIM(LOWER(name)) IN ({placeholders})
-    """
+    # One round trip either way: the population rows carry the name and
+    # state too. Without them, a single TRU row per state is enough, so the
+    # names come from the Total rows unless another TRU was asked for.
+    if include_population:
+        query = POPULATION_QUERY_TRU if tru else POPULATION_QUERY
+    else:
+        query = STATE_NAMES_QUERY
+        tru = tru or "total"
 
     if tru:
-        meta_query += f" AND TRIM(LOWER(tru)) = ${len(base_values)+1}"
-        pop_query += f" AND TRIM(LOWER(tru)) = ${len(base_values)+1}"
         base_values.append(tru.strip().lower())
 
     async with app.state.db_pool.acquire() as conn:
         try:
-            meta_rows = await conn.fetch(meta_query, *base_values)
-            if not meta_rows:
+            rows = await conn.fetch(query, *base_values)
+            if not rows:
                 raise HTTPException(status_code=404, detail="No matching states found")
 
-            results = []
-            for row in meta_rows:
-                state_entry = {"name": row["name"], "state": row["state"]}
+            by_state = {}
+            for row in rows:
+                entry = by_state.get(row["state"])
+                if entry is None:
+                    entry = by_state[row["state"]] = {
+                        "name": row["name"],
+                        "state": row["state"],
+                    }
+                    if include_population:
+                        entry["population"] = {}
                 if include_population:
-                    state_entry["population"] = {}
-                results.append(state_entry)
-
-            if include_population:
-                pop_rows = await conn.fetch(pop_query, *base_values)
-                for row in pop_rows:
-                    for state in results:
-                        if state["state"] == row["state"]:
-                            state["population"][row["tru"].lower()] = row["population"]
+                    entry["population"][row["tru"]] = row["population"]
 
-            return JSONResponse(content=results)
+            return ORJSONResponse(list(by_state.values()))
 
         except Exception as e:
             raise HTTPException(status_code=500, detail=str(e))
 
 
+GENDER_QUERY = """
+    SELECT name, state, tru_norm AS tru, tot_p, tot_m, tot_f
+    FROM census_data
+    WHERE level_norm = 'state'
+    AND state = ANY($1::int[])
+"""
+GENDER_QUERY_TRU = GENDER_QUERY + TRU_FILTER
+
+
 @app.get("/state-gender-population")
+@cache(expire=CACHE_TTL)
 async def get_state_gender_population(
     states: str = Query(
         ...,
@@ -243,35 +496,29 @@ async def get_state_gender_population(
     if not values:
         raise HTTPException(status_code=400, detail="No valid state names provided.")
 
-    placeholders = ", ".join(f"${i+1}" for i in range(len(values)))
-
-    gender_query = f"""
-        SELECT name, state, tru, tot_p, tot_m, tot_f
-        FROM census_data
-        WHERE TRIM(LOWER(level)) = 'state'
-        AND TRIM(LOWER(name)) IN ({placeholders})
-    """
-
+    query = GENDER_QUERY
+    args = [state_codes(values)]
     if tru:
-        gender_query += f" AND TRIM(LOWER(tru)) = ${len(values)+1}"
-        values.append(tru.lower())
+        query = GENDER_QUERY_TRU
+        args.append(tru.lower())
 
     async with app.state.db_pool.acquire() as conn:
         try:
-            rows = await conn.fetch(gender_query, *values)
+            rows = await conn.fetch(query, *args)
             if not rows:
                 raise HTTPException(status_code=404, detail="No data found")
 
-            grouped = defaultdict(lambda: {"population": {}})
-
+            grouped = {}
             for row in rows:
                 state_id = row["state"]
-                state_name = row["name"]
-                tru_key = row["tru"].lower()
+                tru_key = row["tru"]
 
-                if "name" not in grouped[state_id]:
-                    grouped[state_id]["name"] = state_name
-                    grouped[state_id]["state"] = state_id
+                if state_id not in grouped:
+                    grouped[state_id] = {
+                        "name": row["name"],
+                        "state": state_id,
+                        "population": {},
+                    }
 
                 grouped[state_id]["population"][tru_key] = {
                     "total": row["tot_p"],
@@ -279,12 +526,22 @@ async def get_state_gender_population(
                     "female": row["tot_f"],
                 }
 
-            return JSONResponse(content=list(grouped.values()))
+            return ORJSONResponse(list(grouped.values()))
         except Exception as e:
             raise HTTPException(status_code=500, detail=str(e))
 
 
+LITERACY_QUERY = """
+    SELECT name, state, tru_norm AS tru, p_lit, m_lit, f_lit
+    FROM census_data
+    WHERE level_norm = 'state'
+    AND state = ANY($1::int[])
+"""
+LITERACY_QUERY_TRU = LITERACY_QUERY + TRU_FILTER
+
+
 @app.get("/state-literacy")
+@cache(expire=CACHE_TTL)
 async def get_state_literacy(
     states: str = Query(
         ...,
@@ -306,65 +563,61 @@ async def get_state_literacy(
     if not values:
         raise HTTPException(status_code=400, detail="No valid state names provided.")
 
-    placeholders = ", ".join(f"${i+1}" for i in range(len(values)))
-
-    literacy_query = f"""
-        SELECT name, state, tru, p_lit, m_lit, f_lit
-        FROM census_data
-        WHERE TRIM(LOWER(level)) = 'state'
-        AND TRIM(LOWER(name)) IN ({placeholders})
-    """
-
+    query = LITERACY_QUERY
+    args = [state_codes(values)]
     if tru:
-        literacy_query += f" AND TRIM(LOWER(tru)) = ${len(values)+1}"
-        values.append(tru.lower())
+        query = LITERACY_QUERY_TRU
+        args.append(tru.lower())
 
     async with app.state.db_pool.acquire() as conn:
         try:
-            rows = await conn.fetch(literacy_query, *values)
+            rows = await conn.fetch(query, *args)
             if not rows:
                 raise HTTPException(status_code=404, detail="No data found")
 
+            # Built straight from the rows: with a TRU filter there is one
+            # row per state, otherwise literacy is keyed by TRU.
             grouped = {}
             for row in rows:
                 state_id = row["state"]
-                state_name = row["name"]
-                key = (state_id, state_name)
-                if key not in grouped:
-                    grouped[key] = {}
-
-                tru_key = row["tru"].lower() if tru is None else None
                 literacy_data = {
                     "total": row["p_lit"],
                     "male": row["m_lit"],
                     "female": row["f_lit"],
                 }
 
-                if tru_key:
-                    grouped[key][tru_key] = literacy_data
-                else:
-                    grouped[key] = literacy_data
+                obj = grouped.get(state_id)
+                if obj is None:
+                    obj = grouped[state_id] = {
+                        "name": row["name"],
+                        "state": state_id,
+                    }
+                    if tru:
+                        obj["tru"] = tru.capitalize()
+                    obj["literacy"] = {}
 
-            result = []
-            for (state_id, name), data in grouped.items():
-                obj = {
-                    "name": name,
-                    "state": state_id,
-                }
                 if tru:
-                    obj["tru"] = tru.capitalize()
-                    obj["literacy"] = data
+                    obj["literacy"] = literacy_data
                 else:
-                    obj["literacy"] = data
-                result.append(obj)
+                    obj["literacy"][row["tru"]] = literacy_data
 
-            return JSONResponse(content=result)
+            return ORJSONResponse(list(grouped.values()))
 
         except Exception as e:
             raise HTTPException(status_code=500, detail=str(e))
 
 
+WORKERS_QUERY = """
+    SELECT name, state, tru_norm AS tru, tot_work_p, tot_work_m, tot_work_f
+    FROM census_data
+    WHERE level_norm = 'state'
+    AND state = ANY($1::int[])
+"""
+WORKERS_QUERY_TRU = WORKERS_QUERY + TRU_FILTER
+
+
 @app.get("/state-workers")
+@cache(expire=CACHE_TTL)
 async def get_state_workers(
     states: str = Query(
         ...,
@@ -383,31 +636,22 @@ async def get_state_workers(
     if not values:
         raise HTTPException(status_code=400, detail="No valid state names provided.")
 
-    placeholders = ", ".join(f"${i+1}" for i in range(len(values)))
-
-    # Base query
-    worker_query = f"""
-        SELECT name, state, tru, tot_work_p, tot_work_m, tot_work_f
-        FROM census_data
-        WHERE TRIM(LOWER(level)) = 'state'
-        AND TRIM(LOWER(name)) IN ({placeholders})
-    """
-
-    # TRU filter
+    query = WORKERS_QUERY
+    args = [state_codes(values)]
     if tru:
-        worker_query += f" AND TRIM(LOWER(tru)) = ${len(values)+1}"
-        values.append(tru.lower())
+        query = WORKERS_QUERY_TRU
+        args.append(tru.lower())
 
     async with app.state.db_pool.acquire() as conn:
         try:
-            rows = await conn.fetch(worker_query, *values)
+            rows = await conn.fetch(query, *args)
             if not rows:
                 raise HTTPException(status_code=404, detail="No data found")
 
             grouped = {}
             for row in rows:
                 key = row["state"]
-                tru_key = row["tru"].lower()
+                tru_key = row["tru"]
 
                 if key not in grouped:
                     grouped[key] = {
@@ -422,13 +666,25 @@ async def get_state_workers(
                     "female": row["tot_work_f"],
                 }
 
-            return JSONResponse(content=list(grouped.values()))
+            return ORJSONResponse(list(grouped.values()))
 
         except Exception as e:
             raise HTTPException(status_code=500, detail=str(e))
 
 
+CASTE_QUERY = """
+    SELECT name, state, tru_norm AS tru,
+           p_sc AS sc_total, m_sc AS sc_male, f_sc AS sc_female,
+           p_st AS st_total, m_st AS st_male, f_st AS st_female
+    FROM census_data
+    WHERE level_norm = 'state'
+    AND state = ANY($1::int[])
+"""
+CASTE_QUERY_TRU = CASTE_QUERY + TRU_FILTER
+
+
 @app.get("/state-caste-population")
+@cache(expire=CACHE_TTL)
 async def get_state_caste_population(
     states: str = Query(
         ...,
@@ -447,31 +703,22 @@ async def get_state_caste_population(
     if not values:
         raise HTTPException(status_code=400, detail="No valid state names provided.")
 
-    placeholders = ", ".join(f"${i+1}" for i in range(len(values)))
-
-    caste_query = f"""
-        SELECT name, state, tru,
-               p_sc AS sc_total, m_sc AS sc_male, f_sc AS sc_female,
-               p_st AS st_total, m_st AS st_male, f_st AS st_female
-        FROM census_data
-        WHERE TRIM(LOWER(level)) = 'state'
-        AND TRIM(LOWER(name)) IN ({placeholders})
-    """
-
+    query = CASTE_QUERY
+    args = [state_codes(values)]
     if tru:
-        caste_query += f" AND TRIM(LOWER(tru)) = ${len(values) + 1}"
-        values.append(tru.lower())
+        query = CASTE_QUERY_TRU
+        args.append(tru.lower())
 
     async with app.state.db_pool.acquire() as conn:
         try:
-            rows = await conn.fetch(caste_query, *values)
+            rows = await conn.fetch(query, *args)
             if not rows:
                 raise HTTPException(status_code=404, detail="No data found")
 
             grouped = {}
             for row in rows:
                 state_id = row["state"]
-                tru_key = row["tru"].lower()
+                tru_key = row["tru"]
 
                 if state_id not in grouped:
                     grouped[state_id] = {
@@ -493,13 +740,23 @@ async def get_state_caste_population(
                     },
                 }
 
-            return JSONResponse(content=list(grouped.values()))
+            return ORJSONResponse(list(grouped.values()))
 
         except Exception as e:
             raise HTTPException(status_code=500, detail=str(e))
 
 
+NON_WORKERS_QUERY = """
+    SELECT name, state, tru_norm AS tru, non_work_p, non_work_m, non_work_f
+    FROM census_data
+    WHERE level_norm = 'state'
+    AND state = ANY($1::int[])
+"""
+NON_WORKERS_QUERY_TRU = NON_WORKERS_QUERY + TRU_FILTER
+
+
 @app.get("/state-non-workers")
+@cache(expire=CACHE_TTL)
 async def get_state_non_workers(
     states: str = Query(
         ...,
@@ -519,28 +776,21 @@ async def get_state_non_workers(
     if not values:
         raise HTTPException(status_code=400, detail="No valid state names provided.")
 
-    placeholders = ", ".join(f"${i+1}" for i in range(len(values)))
-
-    query = f"""
-        SELECT name, state, tru, non_work_p, non_work_m, non_work_f
-        FROM census_data
-        WHERE TRIM(LOWER(level)) = 'state'
-        AND TRIM(LOWER(name)) IN ({placeholders})
-    """
-
+    query = NON_WORKERS_QUERY
+    args = [state_codes(values)]
     if tru:
-        query += f" AND TRIM(LOWER(tru)) = ${len(values)+1}"
-        values.append(tru.lower())
+        query = NON_WORKERS_QUERY_TRU
+        args.append(tru.lower())
 
     async with app.state.db_pool.acquire() as conn:
         try:
-            rows = await conn.fetch(query, *values)
+            rows = await conn.fetch(query, *args)
             if not rows:
                 raise HTTPException(status_code=404, detail="No data found")
 
             grouped = {}
             for row in rows:
-                state_key = f"{row['state']}_{row['name']}"
+                state_key = row["state"]
                 if state_key not in grouped:
                     grouped[state_key] = {
                         "name": row["name"],
@@ -548,75 +798,78 @@ async def get_state_non_workers(
                         "non_workers": {},
                     }
 
-                grouped[state_key]["non_workers"][row["tru"].lower()] = {
+                grouped[state_key]["non_workers"][row["tru"]] = {
                     "total": row["non_work_p"],
                     "male": row["non_work_m"],
                     "female": row["non_work_f"],
                 }
 
-            return JSONResponse(content=list(grouped.values()))
+            return ORJSONResponse(list(grouped.values()))
 
         except Exception as e:
             raise HTTPException(status_code=500, detail=str(e))
 
 
+LOCATION_NAMES_QUERY = """
+    SELECT DISTINCT name
+    FROM census_data
+    WHERE level_norm = $1 AND state = $2
+    ORDER BY name
+"""
+
+
 @app.get("/state-locations")
+@cache(expire=CACHE_TTL)
 async def get_state_locations(
     state: str = Query(..., description="State name (e.g. 'Karnataka')")
 ):
-    state_name = state.strip().lower()
+    pool = app.state.db_pool
+
+    try:
+        state_code = app.state.state_codes.get(state.strip().lower())
+        if state_code is None:
+            raise HTTPException(status_code=404, detail="State not found")
+
+        # Helper function to fetch location names for a given level
+        async def fetch_names(level_name):
+            rows = await pool.fetch(LOCATION_NAMES_QUERY, level_name, state_code)
+            return [row["name"] for row in rows]
+
+        # A connection runs one query at a time, so each level is fetched
+        # on its own pool connection and the four queries overlap.
+        districts, subdistricts, towns, villages = await asyncio.gather(
+            fetch_names("district"),
+            fetch_names("sub-district"),
+            fetch_names("town"),
+            fetch_names("village"),
+        )
 
-    async with app.state.db_pool.acquire() as conn:
-        try:
-            # Get state info
-            meta_query = """
-                SELECT DISTINCT state, name
-                FROM census_data
-                WHERE TRIM(LOWER(level)) = 'state' AND TRIM(LOWER(name)) = $1
-                LIMIT 1
-            """
-            meta_row = await conn.fetchrow(meta_query, state_name)
-            if not meta_row:
-                raise HTTPException(status_code=404, detail="State not found")
-
-            state_code = meta_row["state"]
-
-            # Helper function to fetch location names for a given level
-            async def fetch_names(level_name):
-                rows = await conn.fetch(
-                    """
-                    SELECT DISTINCT name
-                    FROM census_data
-                    WHERE TRIM(LOWER(level)) = $1 AND state = $2
-                    ORDER BY name
-                    """,
-                    level_name,
-                    state_code,
-                )
-                return [row["name"] for row in rows]
+        result = {
+            "name": app.state.state_names[state_code],
+            "state": state_code,
+            "districts": districts,
+            "subdistricts": subdistricts,
+            "towns": towns,
+            "villages": villages,
+        }
 
-            # Fetch sequentially to avoid asyncpg conflict
-            districts = await fetch_names("district")
-            subdistricts = await fetch_names("sub-district")
-            towns = await fetch_names("town")
-            villages = await fetch_names("village")
+        return ORJSONResponse(result)
 
-            result = {
-                "name": meta_row["name"],
-                "state": state_code,
-                "districts": districts,
-                "subdistricts": subdistricts,
-                "towns": towns,
-                "villages": villages,
-            }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
 
-            return JSONResponse(content=result)
 
-        except Exception as e:
-            raise HTTPException(status_code=500, detail=str(e))
+HOUSEHOLDS_QUERY = """
+    SELECT name, state, tru_norm AS tru, no_hh, tot_p, tot_m, tot_f, p_06, m_06, f_06
+    FROM census_data
+    WHERE level_norm = 'state'
+    AND state = ANY($1::int[])
+"""
+HOUSEHOLDS_QUERY_TRU = HOUSEHOLDS_QUERY + TRU_FILTER
 
 
 @app.get("/state-households")
+@cache(expire=CACHE_TTL)
 async def get_state_households(
     states: str = Query(
         ...,
@@ -638,171 +891,243 @@ async def get_state_households(
     if not values:
         raise HTTPException(status_code=400, detail="No valid state names provided.")
 
-    placeholders = ", ".join(f"${i+1}" for i in range(len(values)))
-
-    base_query = f"""
-        SELECT name, state, tru, no_hh, tot_p, tot_m, tot_f, p_06, m_06, f_06
-        FROM census_data
-        WHERE TRIM(LOWER(level)) = 'state'
-        AND TRIM(LOWER(name)) IN ({placeholders})
-    """
-
+    query = HOUSEHOLDS_QUERY
+    args = [state_codes(values)]
     if tru:
-        base_query += f" AND TRIM(LOWER(tru)) = ${len(values)+1}"
-        values.append(tru.lower())
+        query = HOUSEHOLDS_QUERY_TRU
+        args.append(tru.lower())
 
     async with app.state.db_pool.acquire() as conn:
         try:
-            rows = await conn.fetch(base_query, *values)
+            rows = await conn.fetch(query, *args)
             if not rows:
                 raise HTTPException(status_code=404, detail="No data found")
 
+            # A TRU filter leaves exactly one row per state, so each row is
+            # a whole result and households is just its count.
+            if tru:
+                return ORJSONResponse(
+                    [
+                        {
+                            "name": row["name"],
+                            "state": row["state"],
+                            "households": row["no_hh"],
+                            "population": {
+                                "total": row["tot_p"],
+                                "male": row["tot_m"],
+                                "female": row["tot_f"],
+                            },
+                            "under_6": {
+                                "total": row["p_06"],
+                                "male": row["m_06"],
+                                "female": row["f_06"],
+                            },
+                        }
+                        for row in rows
+                    ]
+                )
+
+            # Otherwise households is keyed by TRU, and the population
+            # figures are the state's Total row. Row order depends on the
+            # plan the index scan picks, so it can't be relied on.
             state_data = {}
             for row in rows:
-                state_id = row["state"]
-                name = row["name"]
-                tru_value = row["tru"].lower()
-
-                if state_id not in state_data:
-                    state_data[state_id] = {
-                        "name": name,
-                        "state": state_id,
+                entry = state_data.get(row["state"])
+                if entry is None:
+                    entry = state_data[row["state"]] = {
+                        "name": row["name"],
+                        "state": row["state"],
+                        "households": {},
                     }
-
-                    if tru:
-                        state_data[state_id]["households"] = row["no_hh"]
-                    else:
-                        state_data[state_id]["households"] = {}
-
-                    state_data[state_id]["population"] = {
+                if "population" not in entry or row["tru"] == "total":
+                    entry["population"] = {
                         "total": row["tot_p"],
                         "male": row["tot_m"],
                         "female": row["tot_f"],
                     }
-                    state_data[state_id]["under_6"] = {
+                    entry["under_6"] = {
                         "total": row["p_06"],
                         "male": row["m_06"],
                         "female": row["f_06"],
                     }
+                entry["households"][row["tru"]] = row["no_hh"]
 
-                if not tru:
-                    state_data[state_id]["households"][tru_value] = row["no_hh"]
-
-            return JSONResponse(content=list(state_data.values()))
+            return ORJSONResponse(list(state_data.values()))
 
         except Exception as e:
             raise HTTPException(status_code=500, detail=str(e))
 
 
+# The whole tree in one query, grouped by district in district name order,
+# then by sub-district, with each sub-district's own row ahead of its towns
+# and villages ('sub-district' < 'town' < 'village'). Places keep the order
+# they were loaded in.
+HIERARCHY_QUERY = """
+    SELECT level_norm, district, subdistt, name
+    FROM census_data
+    WHERE state = $1
+    AND level_norm = ANY($2::text[])
+    ORDER BY
+        MAX(name) FILTER (WHERE level_norm = 'district')
+            OVER (PARTITION BY district),
+        district, subdistt, level_norm, id
+"""
+# Rows the hierarchy cursor fetches per round trip.
+HIERARCHY_PREFETCH = 2000
+
+
+async def hierarchy_districts(rows, include_subdistricts, include_places):
+    # Builds the tree in one pass over HIERARCHY_QUERY rows and yields each
+    # district once its last row has gone by. Rows are attached to the most
+    # recent district / sub-district, and rows whose parent is missing are
+    # dropped. Repeated district and sub-district rows (one per TRU) are
+    # skipped.
+    district = None
+    district_code = sub_key = None
+    async for row in rows:
+        level = row["level_norm"]
+        if level == "district":
+            if row["district"] != district_code:
+                if district is not None:
+                    yield district
+                district_code = row["district"]
+                district = {"name": row["name"]}
+                if include_subdistricts:
+                    district["subdistricts"] = []
+        elif level == "sub-district":
+            key = (row["district"], row["subdistt"])
+            if key != sub_key and row["district"] == district_code:
+                sub_key = key
+                subdistrict = {"name": row["name"]}
+                if include_places:
+                    subdistrict["towns"] = []
+                    subdistrict["villages"] = []
+                district["subdistricts"].append(subdistrict)
+        elif level in ("town", "village"):
+            if (row["district"], row["subdistt"]) == sub_key:
+                subdistrict[level + "s"].append(row["name"])
+    if district is not None:
+        yield district
+
+
+async def hierarchy_json(state_display, districts):
+    # Serialises one district at a time, so the full tree never has to
+    # exist as Python objects.
+    yield b'{"state":' + orjson.dumps(state_display) + b',"districts":['
+    separator = b""
+    async for district in districts:
+        yield separator + orjson.dumps(district)
+        separator = b","
+    yield b"]}"
+
+
+async def stream_hierarchy(
+    cache_key, state_code, levels, include_subdistricts, include_places
+):
+    # The rows come from a server-side cursor, so only one district is held
+    # as Python objects at a time; the connection stays checked out until
+    # the response has been sent. The encoded body is kept and cached once
+    # it is complete, since @cache can't store a streamed response. Bodies
+    # larger than CACHE_MAX_BYTES wouldn't be stored, so they aren't kept.
+    body = []
+    size = 0
+    async with app.state.db_pool.acquire() as conn:
+        async with conn.transaction():
+            rows = conn.cursor(
+                HIERARCHY_QUERY, state_code, levels, prefetch=HIERARCHY_PREFETCH
+            )
+            districts = hierarchy_districts(rows, include_subdistricts, include_places)
+            async for chunk in hierarchy_json(
+                app.state.state_names[state_code], districts
+            ):
+                if body is not None:
+                    size += len(chunk)
+                    if size > CACHE_MAX_BYTES:
+                        body = None
+                    else:
+                        body.append(chunk)
+                yield chunk
+    if body is None:
+        return
+    # Like @cache, a failing backend only costs the cache entry; the
+    # response has already been sent.
+    try:
+        await FastAPICache.get_backend().set(cache_key, b"".join(body), CACHE_TTL)
+    except Exception:
+        logger.warning(
+            f"Error setting cache key '{cache_key}' in backend:", exc_info=True
+        )
+
+
 @app.get("/state-location-hierarchy")
 async def get_location_hierarchy(
     state: str = Query(..., description="State name"),
     include_subdistricts: bool = Query(True, description="Include sub-districts"),
     include_places: bool = Query(True, description="Include towns and villages"),
 ):
-    async with app.state.db_pool.acquire() as conn:
-        try:
-            state_name = state.strip().lower()
-
-            # 1. Get state info
-            state_row = await conn.fetchrow(
-                """
-                SELECT DISTINCT state, name
-                FROM census_data
-                WHERE TRIM(LOWER(level)) = 'state' AND TRIM(LOWER(name)) = $1
-                LIMIT 1
-            """,
-                state_name,
-            )
+    params = {
+        "state": state,
+        "include_subdistricts": include_subdistricts,
+        "include_places": include_places,
+    }
+    cache_key = census_cache_key(
+        get_location_hierarchy, f"{FastAPICache.get_prefix()}:", kwargs=params
+    )
 
-            if not state_row:
-                raise HTTPException(status_code=404, detail="State not found")
-
-            state_code = state_row["state"]
-            state_display = state_row["name"]
-
-            # 2. Get districts
-            districts = await conn.fetch(
-                """
-                SELECT DISTINCT district, name
-                FROM census_data
-                WHERE state = $1 AND TRIM(LOWER(level)) = 'district'
-                ORDER BY name
-            """,
-                state_code,
+    try:
+        try:
+            cached = await FastAPICache.get_backend().get(cache_key)
+        except Exception:
+            logger.warning(
+                f"Error retrieving cache key '{cache_key}' from backend:",
+                exc_info=True,
             )
+            cached = None
+        if cached is not None:
+            return Response(cached, media_type="application/json")
+
+        state_code = app.state.state_codes.get(state.strip().lower())
+        if state_code is None:
+            raise HTTPException(status_code=404, detail="State not found")
+
+        levels = ["district"]
+        if include_subdistricts:
+            levels.append("sub-district")
+            if include_places:
+                levels += ["town", "village"]
+
+        return StreamingResponse(
+            stream_hierarchy(
+                cache_key, state_code, levels, include_subdistricts, include_places
+            ),
+            media_type="application/json",
+        )
 
-            # Optionally fetch subdistricts
-            sub_map = defaultdict(list)
-            place_map = defaultdict(lambda: {"towns": [], "villages": []})
-
-            if include_subdistricts:
-                subdistricts = await conn.fetch(
-                    """
-                    SELECT DISTINCT subdistt, district, name
-                    FROM census_data
-                    WHERE state = $1 AND TRIM(LOWER(level)) = 'sub-district'
-                """,
-                    state_code,
-                )
-
-                # Optionally fetch towns & villages
-                if include_places:
-                    places = await conn.fetch(
-                        """
-                        SELECT name, level, district, subdistt
-                        FROM census_data
-                        WHERE state = $1 AND TRIM(LOWER(level)) IN ('town', 'village')
-                    """,
-                        state_code,
-                    )
-
-                    for p in places:
-                        key = (p["district"], p["subdistt"])
-                        if p["level"].lower() == "town":
-                            place_map[key]["towns"].append(p["name"])
-                        else:
-                            place_map[key]["villages"].append(p["name"])
-
-                for sub in subdistricts:
-                    key = sub["district"]
-                    sub_key = (sub["district"], sub["subdistt"])
-                    sub_map[key].append(
-                        {
-                            "name": sub["name"],
-                            **(
-                                {
-                                    "towns": place_map[sub_key]["towns"],
-                                    "villages": place_map[sub_key]["villages"],
-                                }
-                                if include_places
-                                else {}
-                            ),
-                        }
-                    )
-
-            # 3. Build response
-            result = {"state": state_display, "districts": []}
-
-            for dist in districts:
-                result["districts"].append(
-                    {
-                        "name": dist["name"],
-                        **(
-                            {"subdistricts": sub_map.get(dist["district"], [])}
-                            if include_subdistricts
-                            else {}
-                        ),
-                    }
-                )
-
-            return JSONResponse(content=result)
-
-        except Exception as e:
-            raise HTTPException(status_code=500, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+DISTRICT_POPULATION_SELECT = """
+    SELECT c.name AS district, s.name AS state, c.tru_norm AS tru,
+           c.tot_p AS total, c.tot_m AS male, c.tot_f AS female
+    FROM census_data c
+    JOIN mv_states s ON c.state = s.state
+    WHERE c.state = ANY($1::int[])
+    AND c.level_norm = 'district'
+"""
+DISTRICT_POPULATION_QUERY = DISTRICT_POPULATION_SELECT + """
+    ORDER BY s.name, c.name
+    LIMIT $2 OFFSET $3
+"""
+DISTRICT_POPULATION_QUERY_TRU = DISTRICT_POPULATION_SELECT + """
+    AND c.tru_norm = $2
+    ORDER BY s.name, c.name
+    LIMIT $3 OFFSET $4
+"""
 
 
 @app.get("/district-population-breakdown")
+@cache(expire=CACHE_TTL)
 async def get_district_population_breakdown(
     states: str = Query(
         ...,
@@ -821,62 +1146,49 @@ async def get_district_population_breakdown(
     if not state_values:
         raise HTTPException(status_code=400, detail="No valid state names provided.")
 
-    placeholders = ", ".join(f"${i+1}" for i in range(len(state_values)))
-    values = state_values.copy()
-
-    query = f"""
-        SELECT c.name AS district, s.name AS state, c.tru,
-               c.tot_p AS total, c.tot_m AS male, c.tot_f AS female
-        FROM census_data c
-        JOIN (
-            SELECT DISTINCT state, name
-            FROM census_data
-            WHERE TRIM(LOWER(level)) = 'state' AND TRIM(LOWER(name)) IN ({placeholders})
-        ) s ON c.state = s.state
-        WHERE TRIM(LOWER(c.level)) = 'district'
-    """
-
+    query = DISTRICT_POPULATION_QUERY
+    values = [state_codes(state_values)]
     if tru:
-        query += f" AND TRIM(LOWER(c.tru)) = ${len(values)+1}"
+        query = DISTRICT_POPULATION_QUERY_TRU
         values.append(tru.strip().lower())
 
-    query += " ORDER BY s.name, c.name"
-
-    if limit:
-        query += f" LIMIT {limit}"
-    if offset:
-        query += f" OFFSET {offset}"
+    # LIMIT NULL means no limit, which is also what limit=0 has always meant.
+    values += [limit or None, offset]
 
     async with app.state.db_pool.acquire() as conn:
         try:
             rows = await conn.fetch(query, *values)
 
-            from collections import defaultdict
-
-            grouped_states = defaultdict(lambda: defaultdict(dict))
+            # Build the response in one pass; populations holds each
+            # district's TRU dict so later rows for it can be added.
+            grouped_states = {}
+            populations = {}
 
             for row in rows:
                 state = row["state"]
                 district = row["district"]
-                tru_key = row["tru"].lower()
 
-                grouped_states[state][district][tru_key] = {
+                state_obj = grouped_states.get(state)
+                if state_obj is None:
+                    state_obj = grouped_states[state] = {
+                        "state": state,
+                        "districts": [],
+                    }
+
+                population = populations.get((state, district))
+                if population is None:
+                    population = populations[(state, district)] = {}
+                    state_obj["districts"].append(
+                        {"name": district, "population": population}
+                    )
+
+                population[row["tru"]] = {
                     "total": row["total"],
                     "male": row["male"],
                     "female": row["female"],
                 }
 
-            # Build structured response
-            result = []
-            for state, districts in grouped_states.items():
-                state_obj = {"state": state, "districts": []}
-                for dist_name, tru_data in districts.items():
-                    state_obj["districts"].append(
-                        {"name": dist_name, "population": tru_data}
-                    )
-                result.append(state_obj)
-
-            return JSONResponse(content=result)
+            return ORJSONResponse(list(grouped_states.values()))
 
         except Exception as e:
             raise HTTPException(status_code=500, detail=str(e))
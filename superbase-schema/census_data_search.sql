@@ -0,0 +1,8 @@
+-- Trimmed, lower-cased copies of level and name. The API filters on
+-- level_norm through a plain btree index instead of scanning the table,
+-- and mv_states reads name_norm to resolve state names.
+alter table census_data
+  add column level_norm TEXT generated always as (TRIM(LOWER(level))) stored,
+  add column name_norm TEXT generated always as (TRIM(LOWER(name))) stored;
+
+create index census_data_level_state_idx on census_data (level_norm, state);
@@ -0,0 +1,8 @@
+-- Normalized TRU (total / rural / urban), so TRU filters compare a stored
+-- value instead of calling TRIM(LOWER()) on every row. Run after
+-- census_data_search.sql.
+alter table census_data
+  add column tru_norm TEXT generated always as (TRIM(LOWER(tru))) stored;
+
+create index census_data_level_tru_state_idx
+  on census_data (level_norm, tru_norm, state);
@@ -0,0 +1,12 @@
+-- One row per state (its Total row), for joining state names onto other
+-- levels without de-duplicating census_data on every query. Refresh it
+-- after census_data is (re)loaded:
+--   refresh materialized view concurrently mv_states;
+-- Run after census_data_tru.sql.
+create materialized view mv_states as
+  select state, name, name_norm
+  from census_data
+  where level_norm = 'state' and tru_norm = 'total';
+
+create unique index mv_states_state_idx on mv_states (state);
+create index mv_states_name_idx on mv_states (name_norm);
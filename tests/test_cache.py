@@ -0,0 +1,156 @@
+import unittest
+from unittest import mock
+
+import main
+from main import LRUBackend, census_cache_key
+
+STATE_CODES = {"karnataka": 29, "kerala": 32, "tamil nadu": 33}
+
+
+def key(func, **kwargs):
+    return census_cache_key(func, "census:", kwargs=kwargs)
+
+
+class CensusCacheKeyTest(unittest.TestCase):
+    def setUp(self):
+        patcher = mock.patch.object(
+            main.app.state, "state_codes", STATE_CODES, create=True
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_state_spellings_share_a_key(self):
+        func = main.get_state_literacy
+        self.assertEqual(
+            key(func, states="Karnataka,Tamil Nadu", tru=None),
+            key(func, states=" tamil nadu ,KARNATAKA,karnataka,", tru=None),
+        )
+        self.assertEqual(
+            key(func, states="Kerala", tru="Rural"),
+            key(func, states="kerala", tru="rural"),
+        )
+
+    def test_unknown_names_are_dropped(self):
+        func = main.get_state_literacy
+        self.assertEqual(
+            key(func, states="Kerala,Atlantis", tru=None),
+            key(func, states="Kerala", tru=None),
+        )
+
+    def test_invalid_input_never_maps_onto_a_valid_key(self):
+        func = main.get_state_literacy
+        valid = {
+            key(func, states="Kerala", tru=None),
+            key(func, states="Kerala", tru="rural"),
+        }
+        for states, tru in [
+            ("Atlantis", None),
+            (",", None),
+            (" ", None),
+            ("Kerala", "bogus"),
+        ]:
+            with self.subTest(states=states, tru=tru):
+                self.assertNotIn(key(func, states=states, tru=tru), valid)
+        # No names at all is a 400, names that match nothing are not.
+        self.assertNotEqual(
+            key(func, states=",", tru=None), key(func, states="Atlantis", tru=None)
+        )
+
+    def test_unknown_state_is_not_a_valid_key(self):
+        func = main.get_location_hierarchy
+        params = {"include_subdistricts": True, "include_places": True}
+        self.assertEqual(
+            key(func, state=" kerala ", **params), key(func, state="Kerala", **params)
+        )
+        self.assertNotEqual(
+            key(func, state="Atlantis", **params), key(func, state="Kerala", **params)
+        )
+
+    def test_fields(self):
+        func = main.list_states
+        params = {
+            "sort_by": "state",
+            "sort_order": "asc",
+            "state_code": None,
+            "limit": 100,
+            "offset": 0,
+        }
+        self.assertEqual(
+            key(func, fields="name, state,bogus", **params),
+            key(func, fields="name,state", **params),
+        )
+        # Only unknown fields is a 400; no fields at all uses the defaults.
+        self.assertNotEqual(
+            key(func, fields="bogus", **params), key(func, fields=None, **params)
+        )
+
+    def test_handlers_do_not_share_keys(self):
+        self.assertNotEqual(
+            key(main.get_state_literacy, states="Kerala", tru=None),
+            key(main.get_state_workers, states="Kerala", tru=None),
+        )
+
+
+class LRUBackendTest(unittest.IsolatedAsyncioTestCase):
+    async def test_get_and_size(self):
+        backend = LRUBackend(100)
+        await backend.set("a", b"x" * 10, 60)
+        await backend.set("b", b"y" * 20, 60)
+        self.assertEqual(await backend.get("a"), b"x" * 10)
+        self.assertIsNone(await backend.get("missing"))
+        self.assertEqual(backend._size, 30)
+
+        # Replacing a key accounts for the old body.
+        await backend.set("a", b"z" * 5, 60)
+        self.assertEqual(backend._size, 25)
+        self.assertEqual(await backend.get("a"), b"z" * 5)
+
+    async def test_evicts_least_recently_used(self):
+        backend = LRUBackend(30)
+        await backend.set("a", b"a" * 10, 60)
+        await backend.set("b", b"b" * 10, 60)
+        await backend.set("c", b"c" * 10, 60)
+        await backend.get("a")  # now "b" is the oldest
+        await backend.set("d", b"d" * 10, 60)
+
+        self.assertIsNone(await backend.get("b"))
+        for k in "acd":
+            self.assertIsNotNone(await backend.get(k))
+        self.assertEqual(backend._size, 30)
+
+        # One large body can push out several small ones.
+        await backend.set("e", b"e" * 25, 60)
+        self.assertEqual(list(backend._entries), ["e"])
+        self.assertEqual(backend._size, 25)
+
+    async def test_oversized_body_is_not_stored(self):
+        backend = LRUBackend(10)
+        await backend.set("a", b"a" * 5, 60)
+        await backend.set("a", b"a" * 11, 60)
+        await backend.set("b", b"b" * 11, 60)
+        self.assertIsNone(await backend.get("a"))
+        self.assertIsNone(await backend.get("b"))
+        self.assertEqual(backend._size, 0)
+
+    async def test_expiry(self):
+        backend = LRUBackend(100)
+        with mock.patch.object(main.time, "monotonic", return_value=1000.0):
+            await backend.set("a", b"a" * 10, 60)
+            self.assertEqual(await backend.get_with_ttl("a"), (60, b"a" * 10))
+        with mock.patch.object(main.time, "monotonic", return_value=1060.0):
+            self.assertEqual(await backend.get_with_ttl("a"), (0, None))
+        self.assertEqual(backend._size, 0)
+
+    async def test_clear(self):
+        backend = LRUBackend(100)
+        await backend.set("census:a", b"1", 60)
+        await backend.set("census:b", b"22", 60)
+        await backend.set("other:c", b"333", 60)
+        self.assertEqual(await backend.clear(key="other:c"), 1)
+        self.assertEqual(await backend.clear(namespace="census:"), 2)
+        self.assertEqual(backend._size, 0)
+        self.assertEqual(await backend.clear(key="missing"), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,47 @@
+import unittest
+from unittest import mock
+
+from starlette.requests import Request
+
+import main
+
+
+def request(path, query=""):
+    return Request(
+        {
+            "type": "http",
+            "method": "GET",
+            "path": path,
+            "query_string": query.encode(),
+            "headers": [],
+        }
+    )
+
+
+class UrlEtagTest(unittest.TestCase):
+    def test_parameter_order_does_not_matter(self):
+        self.assertEqual(
+            main.url_etag(request("/state-literacy", "states=Kerala&tru=rural")),
+            main.url_etag(request("/state-literacy", "tru=rural&states=Kerala")),
+        )
+
+    def test_path_and_values_change_the_tag(self):
+        tags = {
+            main.url_etag(request("/state-literacy", "states=Kerala")),
+            main.url_etag(request("/state-workers", "states=Kerala")),
+            main.url_etag(request("/state-literacy", "states=Goa")),
+            main.url_etag(request("/state-literacy", "")),
+        }
+        self.assertEqual(len(tags), 4)
+
+    def test_tag_is_stable_and_versioned(self):
+        tag = main.url_etag(request("/states", "limit=5"))
+        self.assertEqual(tag, main.url_etag(request("/states", "limit=5")))
+        self.assertTrue(tag.startswith(f'"census-v{main.DATA_VERSION}-'))
+        self.assertTrue(tag.endswith('"'))
+        with mock.patch.object(main, "DATA_VERSION", "next"):
+            self.assertNotEqual(main.url_etag(request("/states", "limit=5")), tag)
+
+
+if __name__ == "__main__":
+    unittest.main()
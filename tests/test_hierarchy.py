@@ -0,0 +1,123 @@
+import unittest
+
+import orjson
+
+from main import hierarchy_districts, hierarchy_json
+
+
+async def as_rows(rows):
+    for row in rows:
+        yield row
+
+
+async def collect(items):
+    return [item async for item in items]
+
+
+def row(level, district, subdistt, name):
+    return {
+        "level_norm": level,
+        "district": district,
+        "subdistt": subdistt,
+        "name": name,
+    }
+
+
+# Rows for one state in HIERARCHY_QUERY order: districts by name (so code 2
+# before code 1), every district and sub-district repeated once per TRU,
+# and rows whose parent is missing sorted where the query would put them.
+ROWS = [
+    row("district", 2, 0, "Alpha"),
+    row("district", 2, 0, "Alpha"),
+    row("district", 2, 0, "Alpha"),
+    row("sub-district", 2, 1, "Alpha One"),
+    row("sub-district", 2, 1, "Alpha One"),
+    row("town", 2, 1, "Alpha Town"),
+    row("village", 2, 1, "Alpha Village 1"),
+    row("village", 2, 1, "Alpha Village 2"),
+    row("sub-district", 2, 2, "Alpha Two"),
+    row("village", 2, 2, "Alpha Village 3"),
+    row("district", 1, 0, "Beta"),
+    row("sub-district", 1, 1, "Beta One"),
+    row("village", 1, 1, "Beta Village"),
+    # Places of a sub-district with no row of its own.
+    row("village", 1, 3, "Lost Village"),
+    # A district with no row of its own has no name, so it sorts last.
+    row("sub-district", 7, 1, "Lost Sub-district"),
+    row("town", 7, 1, "Lost Town"),
+]
+
+
+class HierarchyDistrictsTest(unittest.IsolatedAsyncioTestCase):
+    async def build(self, rows, include_subdistricts=True, include_places=True):
+        return await collect(
+            hierarchy_districts(as_rows(rows), include_subdistricts, include_places)
+        )
+
+    async def test_full_tree(self):
+        self.assertEqual(
+            await self.build(ROWS),
+            [
+                {
+                    "name": "Alpha",
+                    "subdistricts": [
+                        {
+                            "name": "Alpha One",
+                            "towns": ["Alpha Town"],
+                            "villages": ["Alpha Village 1", "Alpha Village 2"],
+                        },
+                        {
+                            "name": "Alpha Two",
+                            "towns": [],
+                            "villages": ["Alpha Village 3"],
+                        },
+                    ],
+                },
+                {
+                    "name": "Beta",
+                    "subdistricts": [
+                        {"name": "Beta One", "towns": [], "villages": ["Beta Village"]},
+                    ],
+                },
+            ],
+        )
+
+    async def test_without_places(self):
+        rows = [r for r in ROWS if r["level_norm"] in ("district", "sub-district")]
+        self.assertEqual(
+            await self.build(rows, include_places=False),
+            [
+                {
+                    "name": "Alpha",
+                    "subdistricts": [{"name": "Alpha One"}, {"name": "Alpha Two"}],
+                },
+                {"name": "Beta", "subdistricts": [{"name": "Beta One"}]},
+            ],
+        )
+
+    async def test_districts_only(self):
+        rows = [r for r in ROWS if r["level_norm"] == "district"]
+        self.assertEqual(
+            await self.build(rows, include_subdistricts=False),
+            [{"name": "Alpha"}, {"name": "Beta"}],
+        )
+
+    async def test_no_rows(self):
+        self.assertEqual(await self.build([]), [])
+
+
+class HierarchyJsonTest(unittest.IsolatedAsyncioTestCase):
+    async def test_body_is_the_whole_tree(self):
+        districts = [{"name": "Alpha", "subdistricts": []}, {"name": "Beta"}]
+        body = b"".join(await collect(hierarchy_json("Kerala", as_rows(districts))))
+        self.assertEqual(
+            orjson.loads(body), {"state": "Kerala", "districts": districts}
+        )
+
+    async def test_no_districts(self):
+        body = b"".join(await collect(hierarchy_json("Kerala", as_rows([]))))
+        self.assertEqual(orjson.loads(body), {"state": "Kerala", "districts": []})
+
+
+if __name__ == "__main__":
+    unittest.main()
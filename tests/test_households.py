@@ -0,0 +1,104 @@
+import itertools
+import unittest
+from contextlib import asynccontextmanager
+from unittest import mock
+
+import orjson
+
+import main
+
+# The handler without @cache, which needs FastAPICache.init().
+get_state_households = main.get_state_households.__wrapped__
+
+
+def row(state, tru, no_hh, tot_p):
+    return {
+        "name": f"State {state}",
+        "state": state,
+        "tru": tru,
+        "no_hh": no_hh,
+        "tot_p": tot_p,
+        "tot_m": tot_p // 2,
+        "tot_f": tot_p - tot_p // 2,
+        "p_06": tot_p // 10,
+        "m_06": tot_p // 20,
+        "f_06": tot_p // 10 - tot_p // 20,
+    }
+
+
+ROWS = [
+    row(29, "total", 100, 1000),
+    row(29, "rural", 60, 700),
+    row(29, "urban", 40, 300),
+    row(32, "total", 50, 500),
+    row(32, "rural", 20, 200),
+    row(32, "urban", 30, 300),
+]
+
+
+class FakePool:
+    def __init__(self, rows):
+        self.rows = rows
+        self.args = None
+
+    @asynccontextmanager
+    async def acquire(self):
+        yield self
+
+    async def fetch(self, query, *args):
+        self.args = args
+        return self.rows
+
+
+class StateHouseholdsTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        for name, value in [
+            ("state_codes", {"karnataka": 29, "kerala": 32}),
+            ("db_pool", None),
+        ]:
+            patcher = mock.patch.object(main.app.state, name, value, create=True)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    async def households(self, rows, tru=None):
+        main.app.state.db_pool = FakePool(rows)
+        response = await get_state_households(states="Karnataka,Kerala", tru=tru)
+        return orjson.loads(response.body)
+
+    async def test_population_comes_from_the_total_row(self):
+        # The query doesn't order rows by TRU, so any order must give the
+        # same answer.
+        expected = None
+        for rows in itertools.permutations(ROWS[:3]):
+            with self.subTest(order=[r["tru"] for r in rows]):
+                (result,) = await self.households(list(rows))
+                self.assertEqual(
+                    result["households"], {"total": 100, "rural": 60, "urban": 40}
+                )
+                self.assertEqual(
+                    result["population"], {"total": 1000, "male": 500, "female": 500}
+                )
+                self.assertEqual(
+                    result["under_6"], {"total": 100, "male": 50, "female": 50}
+                )
+                if expected is None:
+                    expected = result
+                self.assertEqual(result, expected)
+
+    async def test_states_are_kept_apart(self):
+        result = await self.households(ROWS[::-1])
+        by_state = {entry["state"]: entry for entry in result}
+        self.assertEqual(sorted(by_state), [29, 32])
+        self.assertEqual(by_state[32]["population"]["total"], 500)
+        self.assertEqual(by_state[32]["households"]["urban"], 30)
+        self.assertEqual(by_state[29]["population"]["total"], 1000)
+
+    async def test_tru_filter_returns_that_row(self):
+        result = await self.households([ROWS[1]], tru="Rural")
+        self.assertEqual(main.app.state.db_pool.args, ([29, 32], "rural"))
+        self.assertEqual(result[0]["households"], 60)
+        self.assertEqual(result[0]["population"]["total"], 700)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+import re
+import unittest
+
+from database_functions.insert_functions import (
+    CENSUS_ROW_SQL,
+    CHILD_TABLES,
+    LOCATION_COLUMNS,
+    LOCATION_FIELDS,
+    CensusRow,
+    _census_row_params,
+)
+
+# One INSERT of CENSUS_ROW_SQL: its table, its column list and the
+# placeholders it inserts (from VALUES or from SELECT l.id, ...).
+INSERT = re.compile(
+    r"INSERT INTO (\w+) \(([^)]*)\) "
+    r"(?:VALUES \(|SELECT l\.id, )([^)]*?)\)?(?: RETURNING| FROM l)"
+)
+
+
+class CensusRowSqlTest(unittest.TestCase):
+    def setUp(self):
+        # Every field gets its own value, so a value identifies its field.
+        self.row = CensusRow(*range(len(CensusRow._fields)))
+        self.params = _census_row_params(self.row)
+        self.inserts = {
+            table: (columns.split(", "), re.findall(r"\$(\d+)", values))
+            for table, columns, values in INSERT.findall(CENSUS_ROW_SQL)
+        }
+
+    def test_inserts_every_table_once(self):
+        self.assertEqual(
+            sorted(self.inserts),
+            sorted(["locations", *(table for table, _ in CHILD_TABLES)]),
+        )
+
+    def test_placeholders_cover_the_params_once(self):
+        numbers = sorted(
+            int(n) for _, placeholders in self.inserts.values() for n in placeholders
+        )
+        self.assertEqual(numbers, list(range(1, len(self.params) + 1)))
+
+    def test_locations_get_the_location_fields(self):
+        columns, placeholders = self.inserts["locations"]
+        self.assertEqual(columns, list(LOCATION_COLUMNS[1:]))
+        values = [self.params[int(n) - 1] for n in placeholders]
+        self.assertEqual(values, [getattr(self.row, f) for f in LOCATION_FIELDS])
+
+    def test_child_columns_get_their_own_fields(self):
+        for table, columns in CHILD_TABLES:
+            sql_columns, placeholders = self.inserts[table]
+            self.assertEqual(sql_columns, list(columns))
+            values = [self.params[int(n) - 1] for n in placeholders]
+            self.assertEqual(values, [getattr(self.row, c) for c in columns[1:]], table)
+
+    def test_ids_come_from_the_database(self):
+        self.assertEqual(len(self.params), len(CensusRow._fields) - 1)
+        self.assertNotIn("id", self.inserts["locations"][0])
+        self.assertTrue(CENSUS_ROW_SQL.endswith("RETURNING location_id"))
+
+
+if __name__ == "__main__":
+    unittest.main()
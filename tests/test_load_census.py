@@ -0,0 +1,96 @@
+import asyncio
+import csv
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from database_functions import load_census
+from database_functions.insert_functions import (
+    CHILD_TABLES,
+    COUNT_FIELDS,
+    TEXT_COLUMNS,
+    CensusRow,
+    Inserters,
+    census_counts,
+)
+
+FIELDS = CensusRow._fields[1:]
+# The sheet's own headers, which _normalize turns back into field names.
+HEADER = [f.upper().replace("TOWN_VILLAGE", "Town/Village") for f in FIELDS]
+
+
+def sheet_row(i):
+    # Every count is distinct, so a value identifies its row and column.
+    return [
+        f"{f}-{i}" if f in TEXT_COLUMNS else i * 1000 + n for n, f in enumerate(FIELDS)
+    ]
+
+
+class FakeConnection:
+    def __init__(self):
+        self.copies = {}
+
+    async def copy_records_to_table(self, table, *, records, columns):
+        self.copies[table] = (columns, list(records))
+        return f"COPY {len(self.copies[table][1])}"
+
+
+class ReadCensusTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        fd, self.path = tempfile.mkstemp(suffix=".csv")
+        self.addCleanup(os.remove, self.path)
+        with os.fdopen(fd, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(HEADER)
+            writer.writerows(sheet_row(i) for i in range(5))
+
+        # Small chunks, so row ids have to carry over between them.
+        queue = asyncio.Queue()
+        with mock.patch.object(load_census, "CHUNK_SIZE", 2):
+            await load_census._read_census_into(self.path, queue)
+        chunks = []
+        while (chunk := queue.get_nowait()) is not None:
+            chunks.append(chunk)
+        self.rows = [row for rows, _ in chunks for row in rows]
+        self.counts = np.concatenate([counts for _, counts in chunks])
+
+    def test_rows(self):
+        self.assertEqual([row.id for row in self.rows], [1, 2, 3, 4, 5])
+        for i, row in enumerate(self.rows):
+            self.assertEqual(list(row[1:]), sheet_row(i))
+            self.assertIsInstance(row.state, int)
+            self.assertIsInstance(row.name, str)
+
+    def test_counts_match_census_counts(self):
+        self.assertEqual(self.counts.dtype, np.int32)
+        self.assertEqual(self.counts.shape, (5, len(COUNT_FIELDS)))
+        np.testing.assert_array_equal(self.counts, census_counts(self.rows))
+        for row, counts in zip(self.rows, self.counts):
+            self.assertEqual(counts.tolist(), [getattr(row, f) for f in COUNT_FIELDS])
+
+    async def test_child_records_take_their_own_columns(self):
+        conn = FakeConnection()
+        inserters = Inserters(conn)
+        ids = range(1, len(self.rows) + 1)
+        for insert in load_census.CHILD_INSERTS:
+            await insert(inserters, ids, self.counts)
+
+        self.assertEqual(sorted(conn.copies), sorted(t for t, _ in CHILD_TABLES))
+        for table, columns in CHILD_TABLES:
+            copied_columns, records = conn.copies[table]
+            self.assertEqual(copied_columns, columns)
+            self.assertEqual(
+                records,
+                [
+                    (row.id, *(getattr(row, c) for c in columns[1:]))
+                    for row in self.rows
+                ],
+                table,
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()